@@ -1,7 +1,7 @@
 # 파일 경로: api/utils.py
 # 코드명: API 공통 유틸리티 함수들 (개선됨)
 
-from flask import jsonify, session, request
+from flask import jsonify, session, request, g
 from datetime import datetime, timezone
 from functools import wraps
 import traceback
@@ -39,6 +39,18 @@ def get_current_username():
     """현재 로그인한 사용자명 반환"""
     return session.get('username')
 
+def get_current_user():
+    """현재 로그인한 사용자 User 객체 반환 (요청당 최대 1회 조회, 없으면 None)
+    
+    권한/활성 여부는 로그인 시 세션에 저장된 값으로 충분하므로
+    DB 행이 꼭 필요한 라우트에서만 호출
+    """
+    if 'user' not in g:
+        from config.models import User
+        user_id = session.get('user_id')
+        g.user = User.query.get(user_id) if user_id else None
+    return g.user
+
 # ============================================================================
 # API 응답 헬퍼 함수들
 # ============================================================================
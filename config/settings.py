@@ -29,7 +29,7 @@ ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@localhost')
 # Flask 설정
 FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
 FLASK_PORT = int(os.getenv('FLASK_PORT', '8888'))
-FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1')
 
 # ============================================================================
 # 디렉토리 설정
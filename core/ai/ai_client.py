@@ -1,29 +1,41 @@
 # 파일 경로: core/ai/ai_client.py
 # 코드명: NAS에서 메인 PC AI 서버와 통신하는 통합 클라이언트
 
+import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import threading
 import logging
 import hashlib
+import atexit
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Callable
 from functools import lru_cache
+from urllib.parse import quote
 from pathlib import Path
 
+try:
+    import orjson  # C 구현 JSON (없으면 표준 json 사용)
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class AIClient:
     """메인 PC AI 서버와 통신하는 통합 클라이언트 (학습/예측/모델관리 통합)"""
     
-    def __init__(self, host: str = "192.168.0.27", port: int = 5000):
+    def __init__(self, host: str = "192.168.0.27", port: int = 5000, max_workers: int = 8):
         """
         AI 클라이언트 초기화
         
         Args:
             host: 메인 PC IP 주소
             port: Flask API 서버 포트
+            max_workers: 병렬 요청(모델 삭제/상세 조회) 최대 스레드 수
         """
         # API 연결 정보
         self.base_url = f"http://{host}:{port}"
@@ -31,6 +43,7 @@ class AIClient:
             # 기본 엔드포인트
             'health': f"{self.base_url}/health",
             'status': f"{self.base_url}/status",
+            'status_stream': f"{self.base_url}/status/stream",
             'system_info': f"{self.base_url}/system/info",
             
             # 학습 관련
@@ -60,6 +73,7 @@ class AIClient:
         # 학습 상태 관리
         self.is_training = False
         self.monitor_thread = None
+        self._stop_event = threading.Event()  # 모니터 스레드 즉시 종료 신호
         self.status_callback = None
         self.training_status = {
             'status': 'idle',
@@ -75,6 +89,9 @@ class AIClient:
             'training_id': None,
             'progress_percentage': 0
         }
+        # 상태 변경 알림 (웹 SSE 스트림이 주기 조회 없이 변경 시점에 깨어나도록)
+        self._status_condition = threading.Condition()
+        self.status_version = 0
         
         # 예측 캐시 설정
         self.cache_enabled = True
@@ -85,12 +102,31 @@ class AIClient:
         # 모델 관리 (로컬 메타데이터)
         self.models_dir = Path("models")
         self.models_dir.mkdir(exist_ok=True)
-        self.metadata_file = self.models_dir / "models_metadata.json"
+        self.db_file = self.models_dir / "models.db"
+        self.metadata_file = self.models_dir / "models_metadata.json"  # 이전 형식 (이관/내보내기용)
         self.active_model_file = self.models_dir / "active_model.txt"
+        self._metadata_lock = threading.RLock()  # 메타데이터 DB 연결을 스레드 간 공유
+        self._etags: Dict[str, str] = {}  # 모델별 ETag (조건부 조회용)
+        atexit.register(self._export_on_exit)  # 종료 시 JSON 사본 갱신
+        self.last_sync_at: Optional[float] = None  # 마지막 원격 동기화 시각 (time.time)
+        self._active_model: Optional[str] = None  # 활성 모델명 캐시
+        self._active_model_mtime: int = -1  # active_model.txt mtime (ns), -1이면 미확인
+        self.max_workers = max(1, max_workers)
+        # 병렬 요청용 스레드 풀 (호출마다 새로 만들지 않고 재사용)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai-client")
+        atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
         self._init_metadata()
         
-        # 연결 상태
+        # 연결 풀: 모니터 스레드/병렬 삭제가 동시에 써도 keep-alive 연결을 버리지 않도록
+        # 메인 PC 한 곳만 접속하므로 풀 1개, 크기는 동시 요청 수 기준
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers + 2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 연결 상태 (성공 결과는 connection_ttl초 동안 재사용)
         self.is_connected = False
+        self.connection_ttl = 5.0
+        self._connection_checked_at: Optional[float] = None  # 마지막 성공 확인 시각 (monotonic)
         self._check_connection()
         
         print(f"✅ AIClient 초기화 완료")
@@ -101,8 +137,16 @@ class AIClient:
     # 공통 기능
     # ============================================================================
     
-    def _check_connection(self) -> bool:
-        """API 서버 연결 확인"""
+    def _check_connection(self, use_cache: bool = False) -> bool:
+        """API 서버 연결 확인
+        
+        Args:
+            use_cache: True면 connection_ttl초 이내의 성공 결과를 요청 없이 재사용
+        """
+        if (use_cache and self.is_connected and self._connection_checked_at is not None
+                and time.monotonic() - self._connection_checked_at < self.connection_ttl):
+            return True
+        
         try:
             response = self.session.get(self.api_endpoints['health'], timeout=5)
             
@@ -110,6 +154,7 @@ class AIClient:
                 data = response.json()
                 if data.get('status') == 'healthy':
                     self.is_connected = True
+                    self._connection_checked_at = time.monotonic()
                     print(f"✅ API 서버 연결 확인: {data.get('service', 'AI Server')}")
                     return True
             
@@ -130,9 +175,26 @@ class AIClient:
             self.is_connected = False
             return False
     
-    def check_connection(self) -> bool:
-        """외부에서 호출 가능한 연결 확인"""
-        return self._check_connection()
+    def _model_url(self, endpoint: str, model_name: str) -> str:
+        """모델 엔드포인트 URL 생성 (모델명은 경로 세그먼트로 인코딩)"""
+        return self.api_endpoints[endpoint].format(model_name=quote(model_name, safe=''))
+    
+    def close(self):
+        """HTTP 연결 풀 및 메타데이터 DB 정리 (종료 시 JSON 사본 갱신)"""
+        self.is_training = False
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        try:
+            self.export_metadata_json()
+        except Exception as e:
+            print(f"⚠️ 메타데이터 내보내기 실패: {e}")
+        with self._metadata_lock:
+            self._db.close()
+    
+    def check_connection(self, force: bool = False) -> bool:
+        """외부에서 호출 가능한 연결 확인 (force=False면 짧은 TTL 캐시 사용)"""
+        return self._check_connection(use_cache=not force)
     
     def get_system_info(self) -> Dict:
         """시스템 정보 조회"""
@@ -165,12 +227,16 @@ class AIClient:
             # 응답 시간 측정
             start_time = time.time()
             
-            # API 연결 테스트
-            results['api_connection'] = self._check_connection()
+            # 연결 확인 + 시스템 정보 조회를 요청 하나로 처리
+            # (/system/info가 성공하면 서버는 연결되어 있고 정상)
+            response = self.session.get(self.api_endpoints['system_info'], timeout=10)
+            result = response.json() if response.status_code == 200 else {}
+            results['api_connection'] = self.is_connected = bool(result.get('success'))
+            if self.is_connected:
+                self._connection_checked_at = time.monotonic()
             
             if results['api_connection']:
-                # 시스템 정보 조회
-                system_info = self.get_system_info()
+                system_info = result.get('system', {})
                 
                 results['server_healthy'] = True
                 results['gpu_available'] = system_info.get('gpu', {}).get('available', False)
@@ -182,6 +248,9 @@ class AIClient:
             elapsed = (time.time() - start_time) * 1000
             results['response_time_ms'] = round(elapsed, 2)
             
+        except requests.exceptions.RequestException as e:
+            print(f"❌ API 서버에 연결할 수 없습니다: {self.base_url} ({e})")
+            self.is_connected = False
         except Exception as e:
             print(f"테스트 중 오류: {e}")
             results['error'] = str(e)
@@ -203,10 +272,7 @@ class AIClient:
             return False
         
         try:
-            # 연결 확인
-            if not self._check_connection():
-                raise Exception("API 서버 연결 실패")
-            
+            # 별도 연결 확인 없이 학습 요청 자체로 연결 여부 판단 (요청 1회)
             # API 요청 데이터 구성
             request_data = {
                 'indicators': selected_indicators,
@@ -245,8 +311,11 @@ class AIClient:
                         'progress_percentage': 0
                     }
                     
+                    self._notify_status_change()
+                    
                     # 상태 모니터링 시작
                     self.status_callback = progress_callback
+                    self._stop_event.clear()
                     self._start_monitoring()
                     
                     print(f"✅ 원격 학습이 시작되었습니다: {result.get('training_id')}")
@@ -268,6 +337,10 @@ class AIClient:
         except requests.exceptions.Timeout:
             print(f"❌ 학습 시작 요청 시간 초과")
             return False
+        except requests.exceptions.ConnectionError:
+            print(f"❌ API 서버에 연결할 수 없습니다: {self.base_url}")
+            self.is_connected = False
+            return False
         except Exception as e:
             print(f"❌ 원격 학습 시작 실패: {e}")
             self.is_training = False
@@ -282,83 +355,80 @@ class AIClient:
         self.monitor_thread.start()
     
     def _monitor_training(self):
-        """학습 상태 모니터링 (백그라운드 스레드)"""
+        """학습 상태 모니터링 (백그라운드 스레드)
+        
+        서버 상태 스트림(/status/stream)을 한 번 열어 두고 변경분이 올 때마다 바로 파싱,
+        스트림을 지원하지 않는 서버면 /status 롱폴링으로 대체
+        """
         
         print("📊 학습 모니터링 시작 (API)")
         error_count = 0
         max_errors = 5
-        check_interval = 5  # 5초마다 상태 확인
+        check_interval = 5  # 오류 시 재시도 간격 (초)
+        long_poll_wait = 25  # 서버가 상태 변경을 기다려 주는 최대 시간 (초)
+        version = None  # 마지막으로 받은 상태 버전 (롱폴링용)
+        use_stream = True
         
         while self.is_training:
             try:
-                # API로 상태 조회
-                response = self.session.get(self.api_endpoints['status'], timeout=10)
-                
-                if response.status_code == 200:
-                    result = response.json()
+                if use_stream:
+                    # 서버 keepalive(최대 30초 간격)보다 길게 읽기 타임아웃 설정
+                    response = self.session.get(
+                        self.api_endpoints['status_stream'],
+                        stream=True,
+                        timeout=(5, long_poll_wait + 15)
+                    )
                     
-                    if result.get('success'):
-                        status = result.get('status', {})
-                        
-                        # 상태 업데이트
-                        self.training_status.update({
-                            'status': status.get('status', 'unknown'),
-                            'current_epoch': status.get('current_epoch', 0),
-                            'total_epochs': status.get('total_epochs', 0),
-                            'accuracy': status.get('accuracy', 0.0),
-                            'loss': status.get('loss', 0.0),
-                            'val_accuracy': status.get('val_accuracy', 0.0),
-                            'val_loss': status.get('val_loss', 0.0),
-                            'model_name': status.get('model_name'),
-                            'error': status.get('error'),
-                            'progress_percentage': status.get('progress_percentage', 0)
-                        })
-                        
-                        # 콜백 호출
-                        if self.status_callback:
-                            message = f"에폭 {status.get('current_epoch', 0)}/{status.get('total_epochs', 0)}"
-                            if status.get('accuracy', 0) > 0:
-                                message += f" (정확도: {status['accuracy']:.3f})"
-                            if status.get('val_accuracy', 0) > 0:
-                                message += f" (검증: {status['val_accuracy']:.3f})"
-                            if status.get('progress_percentage', 0) > 0:
-                                message += f" [{status['progress_percentage']:.1f}%]"
-                            self.status_callback(message)
-                        
-                        # 완료/실패 확인
-                        if status.get('status') == 'completed':
-                            print(f"✅ 학습 완료: {status.get('model_name')}")
-                            self._on_training_completed(status)
-                            break
+                    with response:
+                        if response.status_code == 404:
+                            print("ℹ️ 상태 스트림 미지원 서버 - 롱폴링으로 전환")
+                            use_stream = False
+                            continue
                         
-                        elif status.get('status') == 'failed':
-                            print(f"❌ 학습 실패: {status.get('error')}")
-                            if self.status_callback:
-                                self.status_callback(f"학습 실패: {status.get('error')}")
-                            self.is_training = False
-                            break
+                        if response.status_code == 200:
+                            for line in response.iter_lines(decode_unicode=True):
+                                if self._stop_event.is_set():
+                                    break
+                                if not line.startswith('data:'):
+                                    continue  # keepalive 주석/이벤트 구분 빈 줄
+                                
+                                error_count = 0  # 성공 시 에러 카운트 리셋
+                                if self._handle_training_status(json.loads(line[5:])):
+                                    break
+                            
+                            # 종료 상태 수신/중지 요청이 아니면 (서버가 스트림을 닫음) 재연결
+                            continue
                         
-                        elif status.get('status') == 'stopped':
-                            print(f"⏹️ 학습 중지됨")
-                            if self.status_callback:
-                                self.status_callback("학습이 중지되었습니다")
-                            self.is_training = False
-                            break
+                        print(f"⚠️ 상태 스트림 응답 오류: {response.status_code}")
+                        error_count += 1
+                else:
+                    # API로 상태 조회 (버전을 알면 변경될 때까지 서버에서 대기)
+                    params = {'wait': long_poll_wait, 'version': version} if version is not None else None
+                    response = self.session.get(
+                        self.api_endpoints['status'],
+                        params=params,
+                        timeout=long_poll_wait + 10
+                    )
+                    
+                    if response.status_code == 200:
+                        result = response.json()
                         
-                        error_count = 0  # 성공 시 에러 카운트 리셋
+                        if result.get('success'):
+                            error_count = 0  # 성공 시 에러 카운트 리셋
+                            if self._handle_training_status(result.get('status', {})):
+                                break
+                            
+                            # 롱폴링 미지원 서버(버전 없음)면 기존처럼 주기 폴링
+                            version = result.get('version')
+                            if version is None and self._stop_event.wait(check_interval):
+                                break
+                            continue
+                        else:
+                            print(f"⚠️ 상태 조회 실패: {result.get('error')}")
+                            error_count += 1
                     else:
-                        print(f"⚠️ 상태 조회 실패: {result.get('error')}")
+                        print(f"⚠️ 상태 조회 응답 오류: {response.status_code}")
                         error_count += 1
-                else:
-                    print(f"⚠️ 상태 조회 응답 오류: {response.status_code}")
-                    error_count += 1
-                
-                if error_count >= max_errors:
-                    print(f"❌ 상태 확인 실패 {max_errors}회 초과")
-                    self.is_training = False
-                    break
-                
-                time.sleep(check_interval)
                 
             except requests.exceptions.Timeout:
                 print("⚠️ 상태 조회 시간 초과")
@@ -368,13 +438,80 @@ class AIClient:
                 error_count += 1
                 
             if error_count >= max_errors:
+                print(f"❌ 상태 확인 실패 {max_errors}회 초과")
                 self.is_training = False
                 break
-                
-            time.sleep(check_interval)
+            
+            # 중지 요청 시 대기 중이라도 즉시 종료
+            if self._stop_event.wait(check_interval):
+                break
         
         print("📊 학습 모니터링 종료")
         self.is_training = False
+        self._notify_status_change()
+    
+    def _notify_status_change(self):
+        """training_status 변경 알림 (대기 중인 wait_for_status_change 호출을 깨움)"""
+        with self._status_condition:
+            self.status_version += 1
+            self._status_condition.notify_all()
+    
+    def wait_for_status_change(self, version: int, timeout: float) -> int:
+        """상태 버전이 version과 달라질 때까지 최대 timeout초 대기 후 현재 버전 반환"""
+        with self._status_condition:
+            self._status_condition.wait_for(lambda: self.status_version != version, timeout=timeout)
+            return self.status_version
+    
+    def _handle_training_status(self, status: Dict) -> bool:
+        """수신한 학습 상태 반영 + 콜백 호출 (학습이 끝났으면 True)"""
+        
+        # 상태 업데이트
+        self.training_status.update({
+            'status': status.get('status', 'unknown'),
+            'current_epoch': status.get('current_epoch', 0),
+            'total_epochs': status.get('total_epochs', 0),
+            'accuracy': status.get('accuracy', 0.0),
+            'loss': status.get('loss', 0.0),
+            'val_accuracy': status.get('val_accuracy', 0.0),
+            'val_loss': status.get('val_loss', 0.0),
+            'model_name': status.get('model_name'),
+            'error': status.get('error'),
+            'progress_percentage': status.get('progress_percentage', 0)
+        })
+        self._notify_status_change()
+        
+        # 콜백 호출
+        if self.status_callback:
+            message = f"에폭 {status.get('current_epoch', 0)}/{status.get('total_epochs', 0)}"
+            if status.get('accuracy', 0) > 0:
+                message += f" (정확도: {status['accuracy']:.3f})"
+            if status.get('val_accuracy', 0) > 0:
+                message += f" (검증: {status['val_accuracy']:.3f})"
+            if status.get('progress_percentage', 0) > 0:
+                message += f" [{status['progress_percentage']:.1f}%]"
+            self.status_callback(message)
+        
+        # 완료/실패 확인
+        if status.get('status') == 'completed':
+            print(f"✅ 학습 완료: {status.get('model_name')}")
+            self._on_training_completed(status)
+            return True
+        
+        elif status.get('status') == 'failed':
+            print(f"❌ 학습 실패: {status.get('error')}")
+            if self.status_callback:
+                self.status_callback(f"학습 실패: {status.get('error')}")
+            self.is_training = False
+            return True
+        
+        elif status.get('status') == 'stopped':
+            print(f"⏹️ 학습 중지됨")
+            if self.status_callback:
+                self.status_callback("학습이 중지되었습니다")
+            self.is_training = False
+            return True
+        
+        return False
     
     def _on_training_completed(self, status: Dict):
         """학습 완료 후 처리"""
@@ -388,7 +525,7 @@ class AIClient:
             
             # API로 모델 정보 조회
             response = self.session.get(
-                self.api_endpoints['model_info'].format(model_name=model_name),
+                self._model_url('model_info', model_name),
                 timeout=30
             )
             
@@ -437,7 +574,9 @@ class AIClient:
                 
                 if result.get('success'):
                     self.is_training = False
+                    self._stop_event.set()  # 모니터 스레드 대기 즉시 해제
                     self.training_status['status'] = 'stopped'
+                    self._notify_status_change()
                     print("✅ 원격 학습이 중지되었습니다.")
                     return True
                 else:
@@ -452,11 +591,16 @@ class AIClient:
             return False
     
     def get_training_status(self) -> Dict:
-        """현재 학습 상태 반환"""
-        if self.is_training:
-            # 최신 상태 조회 시도
+        """현재 학습 상태 반환
+        
+        모니터링 스레드가 상태 스트림으로 training_status를 계속 갱신하므로
+        모니터가 살아 있으면 추가 요청 없이 그 값을 그대로 반환
+        """
+        monitor_alive = self.monitor_thread is not None and self.monitor_thread.is_alive()
+        if self.is_training and not monitor_alive:
+            # 최신 상태 조회 시도 (로그 목록 제외한 요약만)
             try:
-                response = self.session.get(self.api_endpoints['status'], timeout=5)
+                response = self.session.get(self.api_endpoints['status'], params={'logs': 0}, timeout=5)
                 if response.status_code == 200:
                     result = response.json()
                     if result.get('success'):
@@ -470,9 +614,10 @@ class AIClient:
     def get_remote_logs(self, lines: int = 50) -> str:
         """원격 학습 로그 조회"""
         try:
+            # 메모리 로그만 사용하므로 서버의 파일 로그 읽기/전송 생략
             response = self.session.get(
                 self.api_endpoints['logs'],
-                params={'lines': lines},
+                params={'lines': lines, 'include_file': 0},
                 timeout=10
             )
             
@@ -684,29 +829,166 @@ class AIClient:
     # ============================================================================
     
     def _init_metadata(self):
-        """메타데이터 파일 초기화"""
-        if not self.metadata_file.exists():
-            self._save_metadata({})
+        """메타데이터 DB 초기화 (models.db, 이전 JSON 메타데이터는 1회 이관)"""
+        self._db = sqlite3.connect(str(self.db_file), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA temp_store=MEMORY")  # 정렬/임시 인덱스를 디스크 대신 메모리에
+        self._db.execute("PRAGMA cache_size=-64000")  # 페이지 캐시 약 64MB (연결을 계속 유지하므로 재사용됨)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS models (
+                name TEXT PRIMARY KEY,
+                created_at TEXT,
+                accuracy REAL,
+                status TEXT,
+                source TEXT,
+                remote_size INTEGER,
+                remote_mtime INTEGER,
+                data TEXT NOT NULL
+            )
+        """)
+        # 인덱스 컬럼 추가 이전에 만들어진 DB 보정 (기존 행은 다음 동기화 때 채워짐)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(models)")}
+        for column in ("remote_size", "remote_mtime"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE models ADD COLUMN {column} INTEGER")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_models_created_at ON models(created_at)")
+        
+        # 이전 버전의 models_metadata.json 이관 (DB가 비어 있을 때만)
+        if self._db.execute("SELECT COUNT(*) FROM models").fetchone()[0] == 0:
+            try:
+                with open(self.metadata_file, 'rb') as f:
+                    raw = f.read()
+                legacy = orjson.loads(raw) if orjson else json.loads(raw)
+            except (FileNotFoundError, ValueError):
+                legacy = {}
+            if legacy:
+                self._write_entries([{**entry, "name": name} for name, entry in legacy.items()])
+                print(f"📦 메타데이터 이관 완료: {len(legacy)}개 모델 → {self.db_file}")
     
-    def _load_metadata(self) -> Dict:
-        """메타데이터 로드"""
-        try:
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
+    @staticmethod
+    def _encode_entry(entry: Dict) -> str:
+        """메타데이터 항목 → JSON 문자열"""
+        if orjson:
+            return orjson.dumps(entry).decode('utf-8')
+        return json.dumps(entry, ensure_ascii=False)
+    
+    @staticmethod
+    def _decode_entry(data: str) -> Dict:
+        """JSON 문자열 → 메타데이터 항목"""
+        return orjson.loads(data) if orjson else json.loads(data)
+    
+    def _get(self, model_name: str) -> Optional[Dict]:
+        """모델 메타데이터 1건 조회"""
+        with self._metadata_lock:
+            row = self._db.execute("SELECT data FROM models WHERE name = ?", (model_name,)).fetchone()
+        return self._decode_entry(row[0]) if row else None
+    
+    def _get_many(self, model_names: List[str]) -> Dict[str, Dict]:
+        """여러 모델 메타데이터 조회 (이름 → 항목)"""
+        if not model_names:
             return {}
+        placeholders = ",".join("?" * len(model_names))
+        with self._metadata_lock:
+            rows = self._db.execute(
+                f"SELECT name, data FROM models WHERE name IN ({placeholders})", list(model_names)
+            ).fetchall()
+        return {name: self._decode_entry(data) for name, data in rows}
+    
+    def _list_index(self) -> List[Dict]:
+        """목록용 경량 메타데이터 (생성일 내림차순, data JSON 디코딩 없음)"""
+        with self._metadata_lock:
+            rows = self._db.execute(
+                "SELECT name, created_at, accuracy, status, source, remote_size, remote_mtime "
+                "FROM models ORDER BY created_at DESC"
+            ).fetchall()
+        return [
+            {
+                "name": name,
+                "created_at": created_at,
+                "accuracy": accuracy,
+                "status": status,
+                "source": source,
+                "remote_stat": [remote_size, remote_mtime] if remote_size is not None else None
+            }
+            for name, created_at, accuracy, status, source, remote_size, remote_mtime in rows
+        ]
     
-    def _save_metadata(self, metadata: Dict):
-        """메타데이터 저장"""
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+    def _list(self) -> List[Dict]:
+        """전체 모델 메타데이터 (생성일 내림차순)"""
+        with self._metadata_lock:
+            rows = self._db.execute("SELECT data FROM models ORDER BY created_at DESC").fetchall()
+        return [self._decode_entry(data) for (data,) in rows]
     
-    def _save_model_metadata(self, model_name: str, model_info: Dict):
-        """모델 메타데이터 저장 (로컬)"""
-        metadata = self._load_metadata()
-        metadata[model_name] = {
+    def _write_entries(self, entries: List[Dict], removed: Optional[List[str]] = None):
+        """항목 UPSERT + 삭제를 한 트랜잭션으로 반영"""
+        rows = []
+        for entry in entries:
+            remote_size, remote_mtime = entry.get("remote_stat") or (None, None)
+            rows.append((
+                entry["name"], str(entry.get("created_at", "")), entry.get("accuracy", 0),
+                entry.get("status"), entry.get("source"), remote_size, remote_mtime,
+                self._encode_entry(entry)
+            ))
+        with self._metadata_lock:
+            self._db.execute("BEGIN")
+            try:
+                if removed:
+                    self._db.executemany("DELETE FROM models WHERE name = ?", [(name,) for name in removed])
+                if rows:
+                    self._db.executemany("""
+                        INSERT INTO models (name, created_at, accuracy, status, source,
+                                            remote_size, remote_mtime, data)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(name) DO UPDATE SET
+                            created_at = excluded.created_at,
+                            accuracy = excluded.accuracy,
+                            status = excluded.status,
+                            source = excluded.source,
+                            remote_size = excluded.remote_size,
+                            remote_mtime = excluded.remote_mtime,
+                            data = excluded.data
+                    """, rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+    
+    def _export_on_exit(self):
+        """프로세스 종료 시 JSON 사본 갱신 (close()에서 이미 닫혔으면 생략)"""
+        try:
+            self.export_metadata_json()
+        except Exception:
+            pass
+    
+    def export_metadata_json(self):
+        """메타데이터를 models_metadata.json으로 내보내기 (이전 버전 호환용)"""
+        metadata = {entry["name"]: entry for entry in self._list()}
+        if orjson:
+            data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(metadata, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        # 임시 파일에 쓴 뒤 교체 → 쓰기 중 중단돼도 기존 파일 유지
+        tmp_file = self.metadata_file.with_name(
+            f"{self.metadata_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.metadata_file)
+    
+    def _build_model_entry(self, model_name: str, model_info: Dict, previous: Optional[Dict] = None,
+                           now_iso: Optional[str] = None) -> Dict:
+        """로컬 메타데이터 항목 생성 (저장은 호출자가 담당)
+        
+        now_iso: 일괄 처리 시 한 번만 만든 현재 시각 문자열 (synced_at/created_at 기본값)
+        """
+        previous = previous or {}
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+        return {
             "name": model_name,
-            "created_at": model_info.get("created_at", datetime.now().isoformat()),
+            "created_at": model_info.get("created_at", now_iso),
             "accuracy": model_info.get("accuracy", 0),
             "val_accuracy": model_info.get("val_accuracy", 0),
             "loss": model_info.get("loss", 0),
@@ -716,10 +998,36 @@ class AIClient:
             "indicators": model_info.get("indicators", {}),
             "training_duration": model_info.get("training_duration", 0),
             "epochs_trained": model_info.get("epochs_trained", 0),
-            "synced_at": datetime.now().isoformat(),
+            "size_mb": model_info.get("size_mb", 0),
+            "remote_stat": self._remote_stat(model_info) or previous.get("remote_stat"),
+            "synced_at": now_iso,
             "source": "mainpc"
         }
-        self._save_metadata(metadata)
+    
+    def _save_model_metadata(self, model_name: str, model_info: Dict):
+        """모델 메타데이터 저장 (로컬, 단건)"""
+        with self._metadata_lock:
+            entry = self._build_model_entry(model_name, model_info, self._get(model_name))
+            self._write_entries([entry])
+    
+    def _save_models_metadata(self, models: List[Dict], removed: Optional[List[str]] = None):
+        """여러 모델 메타데이터를 한 번에 반영 (트랜잭션 1회)"""
+        batch_now = datetime.now().isoformat()
+        models = [model for model in models if model.get('name')]
+        with self._metadata_lock:
+            previous = self._get_many([model['name'] for model in models])
+            entries = [
+                self._build_model_entry(model['name'], model, previous.get(model['name']), batch_now)
+                for model in models
+            ]
+            self._write_entries(entries, removed)
+    
+    @staticmethod
+    def _remote_stat(model_info: Dict) -> Optional[List[int]]:
+        """원격 모델 파일 (크기, 수정시각) 지문 - 목록 API가 제공할 때만"""
+        if 'size_bytes' in model_info and 'modified_at' in model_info:
+            return [model_info['size_bytes'], model_info['modified_at']]
+        return None
     
     def sync_models(self) -> int:
         """메인 PC와 모델 목록 동기화 (API 방식)"""
@@ -734,26 +1042,43 @@ class AIClient:
                 
                 if result.get('success'):
                     remote_models = result.get('models', [])
-                    local_metadata = self._load_metadata()
+                    local_metadata = {entry['name']: entry for entry in self._list_index()}
                     
-                    synced_count = 0
+                    # 메인 PC에서 사라진 모델은 로컬 목록에서도 제거
+                    remote_names = {model.get('name') for model in remote_models}
+                    removed = [name for name in local_metadata if name not in remote_names]
+                    if removed:
+                        print(f"   🗑️ 원격에서 삭제된 모델 제거: {len(removed)}개")
                     
+                    # 변경분만 모아서 마지막에 한 번 저장
+                    updates = []
                     for model in remote_models:
                         model_name = model.get('name')
                         
                         if model_name and model_name not in local_metadata:
-                            # 새 모델 발견 - 메타데이터 저장
+                            # 새 모델 발견
                             print(f"   🆕 새 모델 발견: {model_name}")
-                            self._save_model_metadata(model_name, model)
-                            synced_count += 1
+                            updates.append(model)
                         elif model_name:
-                            # 기존 모델 업데이트
+                            # 기존 모델 업데이트 (파일 크기/수정시각이 같으면 변경 없음)
                             existing = local_metadata.get(model_name, {})
-                            if existing.get('accuracy', 0) != model.get('accuracy', 0):
+                            remote_stat = self._remote_stat(model)
+                            if remote_stat is not None and existing.get('remote_stat') == remote_stat:
+                                continue
+                            if (remote_stat is not None
+                                    or existing.get('accuracy', 0) != model.get('accuracy', 0)):
                                 print(f"   🔄 모델 업데이트: {model_name}")
-                                self._save_model_metadata(model_name, model)
-                                synced_count += 1
+                                updates.append(model)
                     
+                    # 변경된 모델 상세 정보(파라미터/지표 등)는 병렬로 조회
+                    if updates:
+                        updates = self._fetch_model_details(updates)
+                    
+                    if updates or removed:
+                        self._save_models_metadata(updates, removed)
+                    
+                    synced_count = len(updates)
+                    self.last_sync_at = time.time()
                     print(f"✅ 동기화 완료: {synced_count}개 모델")
                     return synced_count
                 else:
@@ -767,6 +1092,26 @@ class AIClient:
             print(f"❌ 동기화 실패: {e}")
             return 0
     
+    def _fetch_model_details(self, models: List[Dict]) -> List[Dict]:
+        """목록 항목별 상세 정보를 병렬 조회해 병합 (실패한 항목은 목록 정보 유지)"""
+        def fetch(model: Dict) -> Dict:
+            try:
+                response = self.session.get(self._model_url('model_info', model['name']), timeout=10)
+                if response.status_code == 200:
+                    result = response.json()
+                    if result.get('success'):
+                        if response.headers.get('ETag'):
+                            self._etags[model['name']] = response.headers['ETag']
+                        return {**model, **result.get('model', {})}
+            except Exception as e:
+                print(f"   ⚠️ 모델 상세 조회 실패 ({model['name']}): {e}")
+            return model
+        
+        if len(models) == 1:
+            return [fetch(models[0])]
+        
+        return list(self._executor.map(fetch, models))
+    
     def get_available_models(self) -> List[Dict]:
         """사용 가능한 모델 목록 조회"""
         try:
@@ -779,83 +1124,109 @@ class AIClient:
                 if result.get('success'):
                     models = result.get('models', [])
                     
-                    # 로컬 메타데이터 업데이트
-                    for model in models:
-                        model_name = model.get('name')
-                        if model_name:
-                            self._save_model_metadata(model_name, model)
+                    # 로컬 메타데이터 업데이트 (1회 저장)
+                    self._save_models_metadata(models)
                     
                     return models
             
             # API 실패 시 로컬 메타데이터 반환
-            metadata = self._load_metadata()
-            return list(metadata.values())
+            return self._list()
             
         except Exception as e:
             print(f"모델 목록 조회 실패: {e}")
             # 로컬 메타데이터 반환
-            metadata = self._load_metadata()
-            return list(metadata.values())
+            return self._list()
     
-    def get_model_list(self) -> List[Dict]:
-        """모델 목록 조회 (최신순 정렬)"""
-        models = self.get_available_models()
+    def sync_if_stale(self, max_age_s: int = 300) -> bool:
+        """마지막 동기화 후 max_age_s초가 지났을 때만 동기화"""
+        if self.last_sync_at is not None and time.time() - self.last_sync_at < max_age_s:
+            return False
+        self.sync_models()
+        return True
+    
+    def get_model_list(self, sync: bool = False, full: bool = False) -> List[Dict]:
+        """모델 목록 조회 (최신순 정렬)
         
-        # 생성일 기준 내림차순 정렬
-        models.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        로컬 메타데이터만 읽음. 원격 최신 상태가 필요하면 sync=True 또는
+        sync_models()/sync_if_stale()를 먼저 호출.
+        기본은 이름/생성일/정확도 등 목록용 필드만 반환하고,
+        parameters/indicators 등 상세 정보는 full=True 또는 get_model_info()로 조회
+        """
+        if sync:
+            self.sync_models()
         
-        return models
+        # 생성일 기준 내림차순 정렬은 DB 조회에서 처리
+        return self._list() if full else self._list_index()
     
     def get_model_info(self, model_name: str) -> Optional[Dict]:
         """특정 모델 정보 조회"""
         try:
+            # 이전 응답의 ETag가 있으면 조건부 조회 (변경 없으면 304)
+            headers = {}
+            etag = self._etags.get(model_name)
+            if etag:
+                headers['If-None-Match'] = etag
+            
             # API로 상세 정보 조회
             response = self.session.get(
-                self.api_endpoints['model_info'].format(model_name=model_name),
+                self._model_url('model_info', model_name),
+                headers=headers,
                 timeout=10
             )
             
+            if response.status_code == 304:
+                cached = self._get(model_name)
+                if cached:
+                    return cached
+                # 로컬 메타데이터 유실 시 ETag 없이 재조회
+                self._etags.pop(model_name, None)
+                return self.get_model_info(model_name)
+            
             if response.status_code == 200:
                 result = response.json()
                 
                 if result.get('success'):
                     model_info = result.get('model', {})
+                    if response.headers.get('ETag'):
+                        self._etags[model_name] = response.headers['ETag']
                     # 로컬 메타데이터 업데이트
                     self._save_model_metadata(model_name, model_info)
                     return model_info
             
             # API 실패 시 로컬 메타데이터에서 조회
-            metadata = self._load_metadata()
-            return metadata.get(model_name)
+            return self._get(model_name)
             
         except Exception as e:
             print(f"모델 정보 조회 실패: {e}")
             # 로컬 메타데이터에서 조회
-            metadata = self._load_metadata()
-            return metadata.get(model_name)
+            return self._get(model_name)
     
     def get_active_model(self) -> Optional[str]:
-        """현재 활성 모델명 조회"""
+        """현재 활성 모델명 조회 (파일 mtime이 그대로면 캐시 반환)"""
         try:
-            if self.active_model_file.exists():
-                with open(self.active_model_file, 'r') as f:
-                    return f.read().strip()
-        except:
-            pass
-        return None
+            mtime = os.stat(self.active_model_file).st_mtime_ns
+        except OSError:
+            self._active_model = None
+            self._active_model_mtime = -1
+            return None
+        
+        if mtime == self._active_model_mtime:
+            return self._active_model
+        
+        try:
+            with open(self.active_model_file, 'r') as f:
+                self._active_model = f.read().strip() or None
+            self._active_model_mtime = mtime
+        except OSError:
+            return None
+        return self._active_model
     
     def set_active_model(self, model_name: str) -> bool:
         """활성 모델 설정"""
         try:
-            # 모델 존재 확인
-            model_info = self.get_model_info(model_name)
-            if not model_info:
-                print(f"모델을 찾을 수 없습니다: {model_name}")
-                return False
-            
-            # API로 활성화 요청
+            # 존재 확인은 서버가 처리 (없는 모델이면 404)
             response = self.session.post(
-                self.api_endpoints['model_activate'].format(model_name=model_name),
+                self._model_url('model_activate', model_name),
                 timeout=10
             )
             
@@ -867,11 +1238,18 @@ class AIClient:
                     with open(self.active_model_file, 'w') as f:
                         f.write(model_name)
                     
+                    # 방금 쓴 값으로 캐시 갱신 (재읽기 생략)
+                    self._active_model = model_name
+                    self._active_model_mtime = os.stat(self.active_model_file).st_mtime_ns
+                    
                     print(f"✅ 활성 모델 변경: {model_name}")
                     return True
                 else:
                     print(f"❌ 모델 활성화 실패: {result.get('error')}")
                     return False
+            elif response.status_code == 404:
+                print(f"모델을 찾을 수 없습니다: {model_name}")
+                return False
             else:
                 print(f"❌ API 응답 오류: {response.status_code}")
                 return False
@@ -888,9 +1266,24 @@ class AIClient:
                 print("활성 모델은 삭제할 수 없습니다.")
                 return False
             
-            # API로 삭제 요청
+            if not self._delete_remote_model(model_name):
+                return False
+            
+            # 로컬 메타데이터에서도 제거
+            self._remove_local_models([model_name])
+            
+            print(f"✅ 모델 삭제 완료: {model_name}")
+            return True
+                
+        except Exception as e:
+            print(f"모델 삭제 실패: {e}")
+            return False
+    
+    def _delete_remote_model(self, model_name: str) -> bool:
+        """메인 PC에 모델 삭제 요청 (로컬 메타데이터는 건드리지 않음)"""
+        try:
             response = self.session.delete(
-                self.api_endpoints['model_delete'].format(model_name=model_name),
+                self._model_url('model_delete', model_name),
                 timeout=10
             )
             
@@ -898,25 +1291,27 @@ class AIClient:
                 result = response.json()
                 
                 if result.get('success'):
-                    # 로컬 메타데이터에서도 제거
-                    metadata = self._load_metadata()
-                    if model_name in metadata:
-                        del metadata[model_name]
-                        self._save_metadata(metadata)
-                    
-                    print(f"✅ 모델 삭제 완료: {model_name}")
                     return True
-                else:
-                    print(f"❌ 모델 삭제 실패: {result.get('error')}")
-                    return False
-            else:
-                print(f"❌ API 응답 오류: {response.status_code}")
+                print(f"❌ 모델 삭제 실패 ({model_name}): {result.get('error')}")
                 return False
-                
+            
+            print(f"❌ API 응답 오류 ({model_name}): {response.status_code}")
+            return False
+            
         except Exception as e:
-            print(f"모델 삭제 실패: {e}")
+            print(f"모델 삭제 실패 ({model_name}): {e}")
             return False
     
+    def _remove_local_models(self, model_names: List[str]):
+        """로컬 메타데이터와 내려받은 모델 파일 제거 (트랜잭션 1회)"""
+        for name in model_names:
+            # download_model로 받은 사본이 있으면 정리 (없으면 무시)
+            (self.models_dir / f"{name}.h5").unlink(missing_ok=True)
+            (self.models_dir / f"{name}_scaler.pkl").unlink(missing_ok=True)
+        
+        if model_names:
+            self._write_entries([], model_names)
+    
     def cleanup_old_models(self, keep_count: int = 5) -> int:
         """오래된 모델 정리"""
         try:
@@ -938,11 +1333,17 @@ class AIClient:
                 else:
                     models_to_delete.append(model_name)
             
-            # 삭제 실행
-            deleted_count = 0
-            for model_name in models_to_delete:
-                if self.delete_model(model_name):
-                    deleted_count += 1
+            # 삭제 실행 (서버에 일괄 삭제 API가 없으므로 병렬 요청)
+            if not models_to_delete:
+                print("✅ 모델 정리 완료: 삭제 대상 없음")
+                return 0
+            
+            results = list(self._executor.map(self._delete_remote_model, models_to_delete))
+            
+            # 원격 삭제에 성공한 모델만 모아 메타데이터 한 번에 갱신
+            deleted = [name for name, ok in zip(models_to_delete, results) if ok]
+            self._remove_local_models(deleted)
+            deleted_count = len(deleted)
             
             print(f"✅ 모델 정리 완료: {deleted_count}개 삭제")
             return deleted_count
@@ -954,13 +1355,28 @@ class AIClient:
     def get_storage_info(self) -> Dict:
         """모델 저장소 정보"""
         try:
-            models = self.get_model_list()
+            # 정렬/디코딩 없이 DB에서 바로 집계
+            with self._metadata_lock:
+                total_count, remote_count = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(status = 'remote'), 0) FROM models"
+                ).fetchone()
+            
+            # 로컬에 내려받은 모델 파일 용량 (디렉토리 1회 순회)
+            local_size = 0
+            with os.scandir(self.models_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.endswith(".h5") or name.endswith("_scaler.pkl"):
+                        local_size += entry.stat().st_size
             
             return {
-                "total_models": len(models),
+                "total_models": total_count,
+                "remote_models": remote_count,
+                "local_models": total_count - remote_count,
+                "local_size_mb": round(local_size / 1024 / 1024, 2),
                 "active_model": self.get_active_model(),
                 "models_directory": str(self.models_dir),
-                "metadata_file": str(self.metadata_file)
+                "metadata_file": str(self.db_file)
             }
             
         except Exception as e:
@@ -969,7 +1385,7 @@ class AIClient:
     
     def generate_model_name(self) -> str:
         """새 모델명 생성"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         return f"model_{timestamp}"
     
     # ============================================================================
@@ -998,14 +1414,15 @@ class AIClient:
                 save_path = self.models_dir / f"{model_name}.h5"
             
             response = self.session.get(
-                self.api_endpoints['model_download'].format(model_name=model_name),
+                self._model_url('model_download', model_name),
                 stream=True,
                 timeout=60
             )
             
             if response.status_code == 200:
+                # 모델 파일은 수십 MB 단위라 큰 청크로 받아 write 호출 수를 줄임
                 with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
                         f.write(chunk)
                 
                 print(f"✅ 모델 다운로드 완료: {save_path}")
@@ -4,11 +4,26 @@
 import threading
 import time
 import os
+import sqlite3
 from flask import Flask, session
 from datetime import timedelta
-from config.settings import load_trading_config, SECRET_KEY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config.settings import load_trading_config, SECRET_KEY, FLASK_HOST, FLASK_PORT, FLASK_DEBUG
 from config.models import db, User, SystemLog
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """SQLite 연결마다 WAL 모드 적용 (읽기 요청이 로그/관리자 쓰기에 막히지 않도록)"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 def create_app():
     """Flask 앱 생성"""
     # 현재 디렉토리 기준으로 templates 폴더 지정
@@ -38,8 +53,7 @@ def create_app():
     data_dir = os.path.join(basedir, 'data')
     
     # data 디렉토리가 없으면 생성
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    os.makedirs(data_dir, exist_ok=True)
     
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(data_dir, "trading_system.db")}'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -83,29 +97,32 @@ def create_app():
                     UserSession.update_activity(session_id)
                 return
             
-            # 추가: 사용자의 계정 활성화 상태 확인
-            user = User.query.get(session.get('user_id'))
-            if user and not user.is_active:
-                # 계정이 비활성화된 경우
-                session.clear()
-                
-                # AJAX 요청인지 확인
-                if request.headers.get('Content-Type') == 'application/json':
-                    # JSON 응답으로 401 에러 반환
-                    from flask import jsonify
-                    return jsonify({
-                        'success': False,
-                        'error': '계정이 비활성화되었습니다',
-                        'code': 'ACCOUNT_DISABLED'
-                    }), 401
-                else:
-                    # 일반 요청은 로그인 페이지로 리다이렉트
-                    return redirect(url_for('auth.login', popup='account_disabled'))
-                        
+            # 계정 비활성화 시 해당 사용자의 DB 세션도 모두 무효화되므로
+            # 매 요청마다 User를 조회하지 않고 DB 세션 확인 하나로 처리
             if session_id:
                 # DB에서 세션 확인
                 db_session = UserSession.get_active_session(session_id)
                 if not db_session:
+                    # 세션이 무효할 때만 비활성화 계정인지 확인 (팝업 구분용)
+                    from api.utils import get_current_user
+                    user = get_current_user()
+                    if user and not user.is_active:
+                        # 계정이 비활성화된 경우
+                        session.clear()
+                        
+                        # AJAX 요청인지 확인
+                        if request.headers.get('Content-Type') == 'application/json':
+                            # JSON 응답으로 401 에러 반환
+                            from flask import jsonify
+                            return jsonify({
+                                'success': False,
+                                'error': '계정이 비활성화되었습니다',
+                                'code': 'ACCOUNT_DISABLED'
+                            }), 401
+                        else:
+                            # 일반 요청은 로그인 페이지로 리다이렉트
+                            return redirect(url_for('auth.login', popup='account_disabled'))
+                    
                     # ✅ 세션이 무효하면 클리어하고 리다이렉트
                     session.clear()
                     
@@ -150,9 +167,11 @@ def create_app():
             admin_password = os.getenv('ADMIN_PASSWORD', 'admin123!')
             admin_email = os.getenv('ADMIN_EMAIL', 'admin@localhost')
             
-            # 기본 admin 사용자 생성 (없을 경우)
-            admin_user = User.query.filter_by(username=admin_username).first()
-            if not admin_user:
+            # 기본 admin 사용자 생성 (없을 경우, 존재 여부만 조회)
+            admin_exists = db.session.query(
+                User.query.filter_by(username=admin_username).exists()
+            ).scalar()
+            if not admin_exists:
                 admin_user = User(
                     username=admin_username,
                     email=admin_email,
@@ -250,7 +269,20 @@ def main():
     print("📝 로그인 계정: .env 파일에서 설정 가능")
     print("="*60)
     
-    app.run(host='0.0.0.0', port=8888, debug=True, threaded=True)
+    # 디버그 모드(리로더/디버거)는 FLASK_DEBUG 설정 시에만 사용
+    if FLASK_DEBUG:
+        app.run(host=FLASK_HOST, port=FLASK_PORT, debug=True, threaded=True)
+        return
+    
+    try:
+        from waitress import serve
+    except ImportError:
+        print("⚠️ waitress 미설치 - Flask 내장 서버로 실행")
+        app.run(host=FLASK_HOST, port=FLASK_PORT, debug=False, threaded=True)
+        return
+    
+    # 학습 상태 SSE 스트림이 연결당 스레드 하나를 잡고 있으므로 여유 있게 설정
+    serve(app, host=FLASK_HOST, port=FLASK_PORT, threads=16)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
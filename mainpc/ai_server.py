@@ -4,14 +4,40 @@
 import os
 import sys
 import json
+import queue
 import threading
 import time
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from datetime import datetime
-from flask import Flask, request, jsonify
+from dataclasses import dataclass, fields, asdict
+from datetime import datetime, timedelta
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from typing import Dict, Optional, Callable
+from typing import Dict, List, Optional, Callable, Iterable, Tuple
+import pandas as pd
+
+try:
+    import ijson  # 대용량 info.json 부분 파싱용 (없으면 json.load 사용)
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # 자주 조회되는 응답의 JSON 직렬화 가속 (없으면 jsonify 사용)
+except ImportError:
+    orjson = None
+
+try:
+    from celery import Celery  # 학습 작업 큐 (없으면 스레드로 실행)
+except ImportError:
+    Celery = None
+
+try:
+    import redis  # Celery 학습 중지 플래그 저장 (브로커와 같은 Redis)
+except ImportError:
+    redis = None
 
 # 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent))
@@ -21,11 +47,60 @@ from nhbot_ai.data_collector import DataCollector
 from nhbot_ai.model_trainer import ModelTrainer
 from nhbot_ai.predictor import AIPredictor
 
+# TensorFlow는 위 모듈들이 이미 로드하므로 GPU 목록/버전은 시작 시 한 번만 조회
+# (서버 실행 중 GPU 구성은 바뀌지 않음)
+import tensorflow as tf
+TF_VERSION = tf.__version__
+GPU_DEVICES = [gpu.name for gpu in tf.config.list_physical_devices('GPU')]
+
 # Flask 앱 생성
 app = Flask(__name__)
-CORS(app, origins=['http://192.168.0.*', 'http://localhost:*'])  # NAS에서 접근 허용
 
-# 로깅 설정
+def _json_default(obj):
+    """jsonify 기본 변환 + deque(메모리 로그)는 리스트로"""
+    if isinstance(obj, deque):
+        return list(obj)
+    return _flask_json_default(obj)
+
+_flask_json_default = app.json.default
+app.json.default = _json_default
+
+def _orjson_default(obj):
+    """orjson이 직접 처리하지 못하는 타입 변환 (deque → 리스트)"""
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(obj).__name__}")
+
+def dumps_json(obj) -> str:
+    """SSE 등 문자열이 필요한 곳의 JSON 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=str)
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """폴링이 잦은 엔드포인트용 jsonify (orjson으로 바이트 직접 생성)"""
+    if orjson is None:
+        response = jsonify(obj)
+        response.status_code = status
+        return response
+    return Response(
+        orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+# NAS에서 접근 허용 (정확한 origin 문자열만 나열해 요청마다 정규식 매칭하지 않도록)
+# 다른 NAS 주소는 AI_SERVER_CORS_ORIGINS에 쉼표로 구분해 지정
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv('AI_SERVER_CORS_ORIGINS', 'http://localhost:8888,http://127.0.0.1:8888').split(',')
+    if origin.strip()
+]
+CORS(app, origins=CORS_ORIGINS)
+
+# 로깅 설정 (로그 파일 핸들러보다 먼저 디렉토리 생성)
+Path('logs').mkdir(exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -40,6 +115,21 @@ logger = logging.getLogger(__name__)
 # 전역 인스턴스 관리
 # ============================================================================
 
+ISO_NOW_RESOLUTION = 0.5  # 현재 시각 문자열 재사용 간격 (초)
+_iso_now_cache = [0.0, '']
+
+def iso_now() -> str:
+    """현재 시각 ISO 문자열 (ISO_NOW_RESOLUTION초 동안은 같은 문자열 재사용)"""
+    now = time.time()
+    if now - _iso_now_cache[0] >= ISO_NOW_RESOLUTION:
+        _iso_now_cache[1] = datetime.fromtimestamp(now).isoformat()
+        _iso_now_cache[0] = now
+    return _iso_now_cache[1]
+
+MAX_MEMORY_LOGS = 100  # 메모리에 유지할 최근 학습 로그 수
+MARKET_REFRESH_INTERVAL = 60  # /predict용 최신 시장 데이터 갱신 주기 (초, 15분봉 기준 충분)
+MARKET_MAX_AGE = MARKET_REFRESH_INTERVAL * 3  # 이보다 오래된 갱신 데이터는 예측에 쓰지 않음 (초)
+
 class AIServerManager:
     """AI 서버 매니저 (싱글톤)"""
     
@@ -57,8 +147,15 @@ class AIServerManager:
             
         self.trainer = None
         self.predictor = None
-        self.data_collector = DataCollector("BTCUSDT")
+        self._predictor_lock = threading.Lock()  # 시작 시 워밍업과 첫 /predict 요청이 중복 로드하지 않도록
+        self.data_collector = DataCollector.shared("BTCUSDT")
+        # 백그라운드 갱신된 최신 15분봉 (monotonic 수집 시각, df)
+        # 튜플 참조 교체만 하므로 읽기에 잠금 불필요
+        self.latest_market: Optional[Tuple[float, pd.DataFrame]] = None
+        self._refresher_started = False
         self.training_thread = None
+        self.celery_task_id: Optional[str] = None  # Celery로 실행 중인 학습 작업 ID
+        self.status_listener: Optional[Callable[[Dict], None]] = None  # 상태 변경 시 호출 (Celery 워커용)
         self.training_status = {
             'status': 'idle',
             'start_time': None,
@@ -66,19 +163,37 @@ class AIServerManager:
             'current_epoch': 0,
             'total_epochs': 0,
             'accuracy': 0.0,
+            'loss': 0.0,
+            'val_accuracy': 0.0,
+            'val_loss': 0.0,
             'model_name': None,
             'error': None,
-            'logs': []
+            'logs': deque(maxlen=MAX_MEMORY_LOGS)  # 오래된 로그는 자동으로 밀려남
         }
         
+        # training_status 읽기/쓰기 잠금 (확인 후 변경, 로그 deque 복사가 다른 스레드와 섞이지 않도록)
+        # 순서: status_lock을 잡은 채 trainer 메서드(스레드 join 포함)를 호출하지 않음
+        self.status_lock = threading.RLock()
+        # 상태 변경 알림 (롱폴링 /status 요청을 변경 시점에 바로 깨움)
+        self.status_condition = threading.Condition(self.status_lock)
+        self.status_version = 0
+        self.training_started_at: Optional[float] = None  # 학습 시작 시각 (monotonic, 경과 시간 계산용)
+        
         # 모델 디렉토리 생성
         self.models_dir = Path("models")
         self.models_dir.mkdir(exist_ok=True)
+        self._models_cache: Optional[Tuple[tuple, List[Dict]]] = None  # (디렉토리 시그니처, /models 목록)
+        self._models_usage: Optional[Tuple[int, int, int]] = None  # (디렉토리 mtime, 모델 수, 전체 크기)
         
         # 로그 디렉토리 생성
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
         
+        # 상태 요약 파일 (logs 제외) + 학습 로그는 JSONL로 이어쓰기 (핸들 유지, 줄 단위 flush)
+        self.status_file = Path("training_status.json")
+        self.log_file = self.logs_dir / "training.jsonl"
+        self._log_handle = open(self.log_file, 'a', encoding='utf-8', buffering=1)
+        
         self._initialized = True
         logger.info("✅ AI Server Manager 초기화 완료")
     
@@ -88,38 +203,505 @@ class AIServerManager:
             self.trainer = ModelTrainer(symbol)
         return self.trainer
     
+    def models_usage(self) -> Tuple[int, int]:
+        """(모델 수, models 디렉토리 전체 크기 바이트)
+        
+        파일 추가/삭제/교체(os.replace) 시 바뀌는 디렉토리 mtime만 확인하고
+        그대로면 이전 값 재사용 (stat 1회), 바뀌었을 때만 다시 훑기
+        """
+        dir_mtime = os.stat(self.models_dir).st_mtime_ns
+        cached = self._models_usage
+        if cached is None or cached[0] != dir_mtime:
+            _, model_stats, total_size = scan_models_dir()
+            cached = self._models_usage = (dir_mtime, len(model_stats), total_size)
+        return cached[1], cached[2]
+    
     def get_predictor(self, symbol: str = "BTCUSDT") -> AIPredictor:
-        """AIPredictor 인스턴스 반환"""
-        if self.predictor is None or self.predictor.symbol != symbol:
-            self.predictor = AIPredictor(symbol)
-        return self.predictor
+        """AIPredictor 인스턴스 반환 (심볼이 같으면 로드·워밍업된 인스턴스 재사용)"""
+        replaced = None
+        with self._predictor_lock:
+            if self.predictor is None or self.predictor.symbol != symbol:
+                replaced = self.predictor
+                self.predictor = AIPredictor(symbol)
+            predictor = self.predictor
+        
+        # 교체된 예측기의 배치 스레드 정리 (잠금 밖에서 join)
+        if replaced is not None:
+            replaced.close()
+        return predictor
+    
+    def warm_predictor(self):
+        """백그라운드에서 예측기 미리 로드 (서버 시작 직후 첫 /predict 지연 방지)"""
+        threading.Thread(target=self.get_predictor, name="predictor-warmup", daemon=True).start()
+    
+    def start_data_refresher(self):
+        """최신 시장 데이터를 주기적으로 받아 두는 스레드 시작 (/predict가 거래소 왕복을 기다리지 않도록)"""
+        if self._refresher_started:
+            return
+        self._refresher_started = True
+        threading.Thread(target=self._refresh_market_data, name="market-data-refresher", daemon=True).start()
+    
+    def _refresh_market_data(self):
+        """MARKET_REFRESH_INTERVAL마다 최신 데이터 수집 (실패 시 이전 데이터 유지)"""
+        while True:
+            self.fetch_market_data()
+            time.sleep(MARKET_REFRESH_INTERVAL)
+    
+    def fetch_market_data(self) -> Optional[pd.DataFrame]:
+        """최신 15분봉 수집 후 수집 시각과 함께 저장 (실패 시 None, 이전 데이터는 유지)"""
+        df = self.data_collector.get_latest_data(interval="15", limit=100)
+        if df is not None:
+            self.latest_market = (time.monotonic(), df)
+        return df
+    
+    def fresh_market_data(self) -> Optional[pd.DataFrame]:
+        """MARKET_MAX_AGE 이내에 수집된 데이터만 반환 (거래소 장애로 갱신이 멈추면 None)"""
+        latest = self.latest_market
+        if latest is None or time.monotonic() - latest[0] > MARKET_MAX_AGE:
+            return None
+        return latest[1]
     
     def update_training_status(self, updates: Dict):
         """학습 상태 업데이트"""
-        self.training_status.update(updates)
-        
-        # 상태 파일 저장 (NAS에서 읽을 수 있도록)
-        status_file = Path("training_status.json")
-        with open(status_file, 'w') as f:
-            json.dump(self.training_status, f, indent=2, default=str)
+        with self.status_condition:
+            self.training_status.update(updates)
+            self.status_version += 1
+            self.status_condition.notify_all()
+            
+            # 상태 파일 저장 (NAS에서 읽을 수 있도록)
+            # 로그 목록은 training.jsonl에 따로 쌓이므로 요약만 기록, 임시 파일 교체로 반쯤 쓴 파일 노출 방지
+            summary = {key: value for key, value in self.training_status.items() if key != 'logs'}
+            tmp_file = self.status_file.with_name(f"{self.status_file.name}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(summary, f, indent=2, default=str)
+            os.replace(tmp_file, self.status_file)
+            
+            if self.status_listener:
+                self.status_listener(self.status_snapshot())
+    
+    def status_snapshot(self) -> Dict:
+        """JSON 직렬화 가능한 상태 사본 (로그 포함)"""
+        with self.status_condition:
+            return {**self.training_status, 'logs': list(self.training_status['logs'])}
+    
+    def begin_training(self, updates: Dict) -> bool:
+        """학습 중이 아니면 상태를 running으로 바꾸고 True (확인과 변경을 한 번에 처리)"""
+        with self.status_condition:
+            if self.training_status['status'] == 'running':
+                return False
+            self.training_started_at = time.monotonic()
+            self.update_training_status({**updates, 'status': 'running'})
+            return True
+    
+    def wait_for_status_change(self, version: int, timeout: float) -> int:
+        """상태 버전이 version과 달라질 때까지 최대 timeout초 대기 후 현재 버전 반환"""
+        with self.status_condition:
+            self.status_condition.wait_for(lambda: self.status_version != version, timeout=timeout)
+            return self.status_version
     
     def add_log(self, message: str, level: str = "INFO"):
         """로그 추가"""
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'level': level,
             'message': message
         }
         
-        self.training_status['logs'].append(log_entry)
-        
-        # 최대 100개 로그만 유지
-        if len(self.training_status['logs']) > 100:
-            self.training_status['logs'] = self.training_status['logs'][-100:]
+        with self.status_lock:
+            self.training_status['logs'].append(log_entry)
+            self._log_handle.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            
+            if self.status_listener:
+                self.status_listener(self.status_snapshot())
 
 # 싱글톤 인스턴스
 ai_manager = AIServerManager()
 
+# ============================================================================
+# 헬퍼 함수
+# ============================================================================
+
+INFO_STREAM_THRESHOLD = 10 * 1024  # 이보다 작은 info.json은 전체 파싱이 더 빠름
+
+def read_info_fields(info_file: Path, fields: Iterable[str]) -> Dict:
+    """모델 info.json에서 필요한 최상위 스칼라 필드만 읽기
+    
+    feature_columns/indicators 등 큰 값이 들어 있는 파일은 ijson으로 스트리밍하며
+    필요한 필드를 모두 찾으면 바로 중단. 파일이 없으면 빈 dict
+    """
+    wanted = set(fields)
+    try:
+        size = info_file.stat().st_size
+    except FileNotFoundError:
+        return {}
+    
+    if ijson is None or size < INFO_STREAM_THRESHOLD:
+        with open(info_file, 'r') as f:
+            info = json.load(f)
+        return {key: info[key] for key in wanted if key in info}
+    
+    result = {}
+    with open(info_file, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix in wanted and event in ('string', 'number', 'boolean', 'null'):
+                result[prefix] = value
+                if len(result) == len(wanted):
+                    break
+    return result
+
+TAIL_CHUNK_SIZE = 8192
+
+def tail_lines(path: Path, lines: int) -> List[str]:
+    """파일 끝에서부터 청크 단위로 거꾸로 읽어 마지막 lines줄 반환 (파일 크기와 무관)"""
+    with open(path, 'rb') as f:
+        if lines <= 0:
+            return f.read().decode('utf-8', errors='replace').splitlines(keepends=True)
+        
+        position = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # 마지막 줄 끝의 개행까지 고려해 lines + 1개의 개행을 찾을 때까지 읽기
+        while position > 0 and newlines <= lines:
+            size = min(TAIL_CHUNK_SIZE, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size)
+            newlines += chunk.count(b'\n')
+            chunks.append(chunk)
+    
+    data = b''.join(reversed(chunks))
+    return data.decode('utf-8', errors='replace').splitlines(keepends=True)[-lines:]
+
+def scan_models_dir() -> Tuple[tuple, Dict[str, os.stat_result], int]:
+    """models 디렉토리를 scandir 한 번으로 훑기
+    
+    반환: (model_* 파일 이름/mtime/크기 시그니처, 모델명 → .h5 stat, 전체 파일 크기 합)
+    """
+    signature = []
+    model_stats = {}
+    total_size = 0
+    with os.scandir(ai_manager.models_dir) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            total_size += stat.st_size
+            if entry.name.startswith('model_'):
+                signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+                if entry.name.endswith('.h5'):
+                    model_stats[entry.name[:-3]] = stat
+    return tuple(sorted(signature)), model_stats, total_size
+
+# 모델 info.json 병렬 읽기용 (요청마다 만들지 않고 재사용)
+info_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="model-info")
+
+def list_models() -> List[Dict]:
+    """모델 목록 (model_* 파일이 추가/변경/삭제되지 않았으면 이전 목록 재사용)"""
+    signature, model_stats, _ = scan_models_dir()
+    cached = ai_manager._models_cache
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    # info.json 읽기는 I/O 대기가 대부분이므로 병렬로 겹쳐 실행
+    def load_info(model_name: str) -> Dict:
+        info_file = ai_manager.models_dir / f"{model_name}_info.json"
+        return read_info_fields(info_file, ('created_at', 'accuracy'))
+    
+    infos = list(info_executor.map(load_info, model_stats))
+    
+    models = []
+    for (model_name, model_stat), info in zip(model_stats.items(), infos):
+        models.append({
+            'name': model_name,
+            'created_at': info.get('created_at', model_stat.st_mtime),
+            'accuracy': info.get('accuracy', 0),
+            'size_mb': round(model_stat.st_size / 1024 / 1024, 2),
+            'size_bytes': model_stat.st_size,
+            'modified_at': int(model_stat.st_mtime)
+        })
+    
+    # 최신순 정렬
+    models.sort(key=lambda x: x['created_at'], reverse=True)
+    
+    ai_manager._models_cache = (signature, models)
+    return models
+
+@dataclass(frozen=True)
+class TrainParams:
+    """학습 요청 파라미터 (요청당 한 번 타입 검증 + 기본값 채움)"""
+    symbol: str = 'BTCUSDT'
+    training_days: int = 365
+    epochs: int = 100
+    batch_size: int = 32
+    learning_rate: float = 0.001
+    sequence_length: int = 60
+    validation_split: int = 20
+    interval: str = '15'
+    
+    def __post_init__(self):
+        errors = []
+        for f in fields(self):
+            value = getattr(self, f.name)
+            # bool은 int의 하위 타입이라 별도로 거름
+            if f.type is int:
+                valid = isinstance(value, int) and not isinstance(value, bool) and value > 0
+            elif f.type is float:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+                if valid:
+                    object.__setattr__(self, f.name, float(value))
+            else:
+                # interval은 숫자(15)로 와도 문자열('15')로 맞춤
+                if f.name == 'interval' and isinstance(value, int) and not isinstance(value, bool):
+                    object.__setattr__(self, f.name, str(value))
+                    value = str(value)
+                valid = isinstance(value, str) and value != ''
+            if not valid:
+                errors.append(f"{f.name}: 잘못된 값 {value!r} ({f.type.__name__} 필요)")
+        if not errors and self.validation_split >= 100:
+            errors.append(f"validation_split: 100 미만이어야 합니다 ({self.validation_split})")
+        if errors:
+            raise ValueError(errors)
+    
+    @classmethod
+    def from_payload(cls, payload) -> Dict:
+        """요청 JSON의 parameters 검증 후 학습 파라미터 dict 반환
+
+        알 수 없는 키(jit_compile 등)는 그대로 전달, 형식 오류 시 ValueError(오류 목록)
+        """
+        if payload is None:
+            payload = {}
+        if not isinstance(payload, dict):
+            raise ValueError(['parameters: 객체여야 합니다'])
+        known = {f.name for f in fields(cls)}
+        params = cls(**{key: value for key, value in payload.items() if key in known})
+        return {**payload, **asdict(params)}
+
+def initial_training_status(training_params: Dict) -> Dict:
+    """학습 시작 시점의 상태 초기값"""
+    return {
+        'start_time': iso_now(),
+        'end_time': None,
+        'current_epoch': 0,
+        'total_epochs': training_params['epochs'],
+        'accuracy': 0.0,
+        'loss': 0.0,  # 이전 학습의 지표가 새 학습 상태에 남지 않도록 모두 초기화
+        'val_accuracy': 0.0,
+        'val_loss': 0.0,
+        'model_name': None,
+        'error': None,
+        'logs': deque(maxlen=MAX_MEMORY_LOGS)
+    }
+
+TRAINING_WAIT_TIMEOUT = 60  # 학습 이벤트 대기 최대 시간 (초)
+
+def run_training(selected_indicators: Dict, training_params: Dict):
+    """학습 실행 후 완료까지 대기 (학습 스레드 또는 Celery 워커에서 호출)"""
+    try:
+        ai_manager.add_log("학습 시작", "INFO")
+        
+        # ModelTrainer 인스턴스
+        trainer = ai_manager.get_trainer(training_params['symbol'])
+        
+        # 진행률 콜백 (메시지는 로그로만 남기고 에폭/메트릭은 스냅샷에서 읽음)
+        def progress_callback(message):
+            ai_manager.add_log(message, "INFO")
+        
+        # 학습 시작
+        success = trainer.start_training(
+            selected_indicators,
+            training_params,
+            progress_callback
+        )
+        
+        if not success:
+            raise Exception("학습 시작 실패")
+        
+        # 학습 완료 대기 (에폭 시작/종료·학습 종료 이벤트에 깨어남, 타임아웃은 생존 확인용)
+        while trainer.is_training:
+            if not trainer.epoch_event.wait(timeout=TRAINING_WAIT_TIMEOUT):
+                continue
+            trainer.epoch_event.clear()
+            
+            # 상태 업데이트
+            status = trainer.get_training_status()
+            ai_manager.update_training_status({
+                'current_epoch': status.current_epoch,
+                'accuracy': status.accuracy,
+                'loss': status.loss,
+                'val_accuracy': status.val_accuracy,
+                'val_loss': status.val_loss
+            })
+        
+        # 최종 결과
+        final_status = trainer.get_training_status()
+        
+        if final_status.status == 'completed':
+            # 모델명 찾기 (scandir 한 번으로 얻은 stat에서 가장 최근 .h5)
+            _, model_stats, _ = scan_models_dir()
+            if model_stats:
+                model_name = max(model_stats, key=lambda name: model_stats[name].st_mtime_ns)
+            else:
+                model_name = f"model_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            
+            ai_manager.update_training_status({
+                'status': 'completed',
+                'end_time': iso_now(),
+                'model_name': model_name,
+                'accuracy': final_status.accuracy
+            })
+            
+            ai_manager.add_log(f"학습 완료! 정확도: {final_status.accuracy:.3f}", "SUCCESS")
+            logger.info(f"✅ 학습 완료: {model_name}")
+            
+        else:
+            raise Exception(f"학습 실패: {final_status.status}")
+            
+    except Exception as e:
+        logger.error(f"❌ 학습 중 오류: {e}")
+        ai_manager.update_training_status({
+            'status': 'failed',
+            'end_time': iso_now(),
+            'error': str(e)
+        })
+        ai_manager.add_log(f"학습 실패: {str(e)}", "ERROR")
+
+
+# ============================================================================
+# Celery 작업 큐 (선택)
+# ============================================================================
+# CELERY_BROKER_URL이 설정되고 celery가 설치되어 있으면 학습을 웹 프로세스 대신
+# gpu_training 큐를 소비하는 별도 워커에서 실행 (웹 서버 재시작과 무관하게 학습 유지)
+#   celery -A ai_server.celery_app worker -Q gpu_training --concurrency=1 --pool=solo
+#
+# solo 풀에서는 revoke(terminate=True)가 실행 중인 작업을 끝내지 못하므로, 중지는
+# Redis 중지 플래그로 전달하고 워커 안의 감시 스레드가 trainer.stop_training()을 호출
+
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+CELERY_POLL_INTERVAL = 2  # 웹 프로세스가 작업 상태를 가져오는 간격 (초)
+CELERY_STOP_KEY = 'nhbot:training:stop:{task_id}'  # 학습 중지 요청 플래그 (Redis 키)
+CELERY_STOP_TTL = 3600  # 중지 플래그 보관 시간 (초)
+
+celery_app = None
+stop_flags = None
+if CELERY_BROKER_URL and Celery is not None:
+    celery_app = Celery(
+        'ai_server',
+        broker=CELERY_BROKER_URL,
+        backend=os.getenv('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+    )
+    celery_app.conf.update(
+        task_routes={'ai_server.run_training_task': {'queue': 'gpu_training'}},
+        task_track_started=True,
+        worker_prefetch_multiplier=1
+    )
+    if redis is not None and CELERY_BROKER_URL.startswith(('redis://', 'rediss://')):
+        stop_flags = redis.Redis.from_url(CELERY_BROKER_URL)
+    
+    @celery_app.task(bind=True, name='ai_server.run_training_task')
+    def run_training_task(self, selected_indicators: Dict, training_params: Dict) -> Dict:
+        """Celery 학습 작업: 워커 쪽 상태 변경을 작업 메타데이터(PROGRESS)로 전달
+        
+        상태 리스너는 잠금을 잡은 채 호출되므로 큐에 넣기만 하고,
+        브로커로의 update_state 전송은 별도 스레드가 잠금 밖에서 처리
+        """
+        updates = queue.Queue()
+        publisher = threading.Thread(target=publish_task_progress, args=(self, updates),
+                                     name="celery-progress", daemon=True)
+        publisher.start()
+        
+        done = threading.Event()
+        threading.Thread(target=watch_stop_flag, args=(self.request.id, done),
+                         name="celery-stop-watch", daemon=True).start()
+        
+        ai_manager.status_listener = updates.put
+        try:
+            ai_manager.begin_training(initial_training_status(training_params))
+            run_training(selected_indicators, training_params)
+            return ai_manager.status_snapshot()
+        finally:
+            ai_manager.status_listener = None
+            done.set()
+            updates.put(None)
+            publisher.join()
+
+def publish_task_progress(task, updates: queue.Queue):
+    """큐에 쌓인 상태를 Celery 작업 메타데이터로 전송 (밀린 변경은 최신 상태 하나만)"""
+    stopping = False
+    while not stopping:
+        status = updates.get()
+        if status is None:
+            return
+        while True:
+            try:
+                newer = updates.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                stopping = True  # 마지막 상태까지 보내고 종료
+                break
+            status = newer
+        
+        try:
+            task.update_state(state='PROGRESS', meta=status)
+        except Exception as e:
+            logger.warning(f"학습 진행 상태 전송 실패: {e}")
+
+def watch_stop_flag(task_id: str, done: threading.Event):
+    """웹 프로세스가 남긴 중지 플래그를 확인해 워커 안에서 학습 중지 (작업 종료 시 함께 종료)"""
+    if stop_flags is None:
+        return
+    key = CELERY_STOP_KEY.format(task_id=task_id)
+    while not done.wait(CELERY_POLL_INTERVAL):
+        try:
+            requested = stop_flags.exists(key)
+        except redis.RedisError as e:
+            logger.warning(f"학습 중지 플래그 확인 실패: {e}")
+            continue
+        
+        # 학습이 아직 시작 전이면 다음 확인에서 다시 시도
+        trainer = ai_manager.trainer
+        if requested and trainer is not None and trainer.stop_training():
+            stop_flags.delete(key)
+            return
+
+def mirror_celery_task(task_id: str):
+    """Celery 작업 상태를 웹 프로세스의 training_status로 옮김 (/status, SSE 응답용)
+    
+    현재 작업(celery_task_id)이 이 작업일 때만 반영하고, 중지되거나 다른 학습으로
+    바뀌면 종료 (중지 후 늦게 끝나는 이전 작업이 새 학습 상태를 덮어쓰지 않도록)
+    """
+    last_info = None
+    while True:
+        result = celery_app.AsyncResult(task_id)
+        info = result.info
+        ready = result.ready()
+        
+        updates = None
+        if result.state in ('PROGRESS', 'SUCCESS') and isinstance(info, dict) and info != last_info:
+            last_info = info
+            updates = dict(info)
+            if 'logs' in updates:
+                updates['logs'] = deque(updates['logs'], maxlen=MAX_MEMORY_LOGS)
+        
+        # 확인과 반영을 한 번에 (브로커 조회는 잠금 밖에서 끝냄)
+        with ai_manager.status_lock:
+            if ai_manager.celery_task_id != task_id:
+                return
+            if updates is not None and ai_manager.training_status['status'] == 'running':
+                ai_manager.update_training_status(updates)
+            
+            if ready:
+                if result.state != 'SUCCESS' and ai_manager.training_status['status'] == 'running':
+                    ai_manager.update_training_status({
+                        'status': 'stopped' if result.state == 'REVOKED' else 'failed',
+                        'end_time': iso_now(),
+                        'error': None if result.state == 'REVOKED' else str(info)
+                    })
+                ai_manager.celery_task_id = None
+                return
+        
+        time.sleep(CELERY_POLL_INTERVAL)
+
 # ============================================================================
 # API 엔드포인트
 # ============================================================================
@@ -130,7 +712,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'AI Server',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_now(),
         'version': '1.0.0'
     })
 
@@ -138,132 +720,58 @@ def health_check():
 def start_training():
     """AI 모델 학습 시작"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': '요청 본문은 JSON 객체여야 합니다'
+            }), 422
+        
+        # 파라미터 검증 + 기본값 (잘못된 입력은 GPU 학습 시작 전에 거절)
+        selected_indicators = data.get('indicators') or {}
+        try:
+            if not isinstance(selected_indicators, dict):
+                raise ValueError(['indicators: 객체여야 합니다'])
+            training_params = TrainParams.from_payload(data.get('parameters'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': '파라미터 검증 실패',
+                'details': e.args[0]
+            }), 422
         
-        # 이미 학습 중인지 확인
-        if ai_manager.training_status['status'] == 'running':
+        # 이미 학습 중인지 확인 + 상태 초기화 (스레드 시작 전에 running으로 바꿔
+        # 동시 요청이 둘 다 통과하거나 직후 /status 조회가 idle을 보는 일 방지)
+        started = ai_manager.begin_training(initial_training_status(training_params))
+        if not started:
             return jsonify({
                 'success': False,
                 'error': '이미 학습이 진행 중입니다',
-                'status': ai_manager.training_status
+                'status': build_status_payload()
             }), 400
         
-        # 파라미터 추출
-        selected_indicators = data.get('indicators', {})
-        training_params = data.get('parameters', {})
-        
-        # 기본값 설정
-        training_params.setdefault('symbol', 'BTCUSDT')
-        training_params.setdefault('training_days', 365)
-        training_params.setdefault('epochs', 100)
-        training_params.setdefault('batch_size', 32)
-        training_params.setdefault('learning_rate', 0.001)
-        training_params.setdefault('sequence_length', 60)
-        training_params.setdefault('validation_split', 20)
-        training_params.setdefault('interval', '15')
-        
         logger.info(f"🚀 학습 요청 받음: {training_params['epochs']} epochs")
         
-        # 학습 스레드 시작
-        def run_training():
-            try:
-                # 상태 초기화
-                ai_manager.update_training_status({
-                    'status': 'running',
-                    'start_time': datetime.now().isoformat(),
-                    'end_time': None,
-                    'current_epoch': 0,
-                    'total_epochs': training_params['epochs'],
-                    'accuracy': 0.0,
-                    'model_name': None,
-                    'error': None,
-                    'logs': []
-                })
-                
-                ai_manager.add_log("학습 시작", "INFO")
-                
-                # ModelTrainer 인스턴스
-                trainer = ai_manager.get_trainer(training_params['symbol'])
-                
-                # 진행률 콜백
-                def progress_callback(message):
-                    ai_manager.add_log(message, "INFO")
-                    
-                    # 에폭 정보 추출
-                    if "에폭" in message:
-                        try:
-                            parts = message.split('/')
-                            if len(parts) == 2:
-                                current = int(parts[0].split()[-1])
-                                ai_manager.update_training_status({
-                                    'current_epoch': current
-                                })
-                        except:
-                            pass
-                
-                # 학습 시작
-                success = trainer.start_training(
-                    selected_indicators,
-                    training_params,
-                    progress_callback
-                )
-                
-                if not success:
-                    raise Exception("학습 시작 실패")
-                
-                # 학습 완료 대기
-                while trainer.is_training:
-                    time.sleep(5)
-                    
-                    # 상태 업데이트
-                    status = trainer.get_training_status()
-                    ai_manager.update_training_status({
-                        'current_epoch': status.get('current_epoch', 0),
-                        'accuracy': status['metrics'].get('accuracy', 0) if status.get('metrics') else 0
-                    })
-                
-                # 최종 결과
-                final_status = trainer.get_training_status()
-                
-                if final_status['status'] == 'completed':
-                    # 모델명 찾기
-                    model_files = list(ai_manager.models_dir.glob("model_*.h5"))
-                    if model_files:
-                        latest_model = max(model_files, key=lambda x: x.stat().st_mtime)
-                        model_name = latest_model.stem
-                    else:
-                        model_name = f"model_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                    
-                    ai_manager.update_training_status({
-                        'status': 'completed',
-                        'end_time': datetime.now().isoformat(),
-                        'model_name': model_name,
-                        'accuracy': final_status['metrics'].get('accuracy', 0)
-                    })
-                    
-                    ai_manager.add_log(f"학습 완료! 정확도: {final_status['metrics'].get('accuracy', 0):.3f}", "SUCCESS")
-                    logger.info(f"✅ 학습 완료: {model_name}")
-                    
-                else:
-                    raise Exception(f"학습 실패: {final_status.get('status')}")
-                    
-            except Exception as e:
-                logger.error(f"❌ 학습 중 오류: {e}")
-                ai_manager.update_training_status({
-                    'status': 'failed',
-                    'end_time': datetime.now().isoformat(),
-                    'error': str(e)
-                })
-                ai_manager.add_log(f"학습 실패: {str(e)}", "ERROR")
-        
-        # 백그라운드 스레드에서 실행
-        ai_manager.training_thread = threading.Thread(target=run_training, daemon=True)
-        ai_manager.training_thread.start()
+        # 학습 실행 (Celery 사용 시 GPU 워커 큐로 전달, 아니면 백그라운드 스레드)
+        if celery_app is not None:
+            task = run_training_task.delay(selected_indicators, training_params)
+            with ai_manager.status_lock:  # 미러링 스레드가 잠금 안에서 작업 ID를 확인
+                ai_manager.celery_task_id = task.id
+            training_id = task.id
+            threading.Thread(target=mirror_celery_task, args=(task.id,), daemon=True).start()
+        else:
+            ai_manager.training_thread = threading.Thread(
+                target=run_training,
+                args=(selected_indicators, training_params),
+                daemon=True
+            )
+            ai_manager.training_thread.start()
+            training_id = f"train_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         return jsonify({
             'success': True,
             'message': '학습이 시작되었습니다',
-            'training_id': f"train_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'training_id': training_id,
             'parameters': training_params
         })
         
@@ -278,17 +786,44 @@ def start_training():
 def stop_training():
     """학습 중지"""
     try:
+        # Celery 워커에서 실행 중이면 중지를 먼저 기록하고 작업 ID를 비운 뒤
+        # (이 작업의 미러링 스레드는 다음 확인에서 종료, 새 학습 상태를 덮어쓰지 않음)
+        # 워커에 중지 플래그 전달, 대기 중인 작업은 revoke로 취소
+        task_id = None
+        if celery_app is not None:
+            with ai_manager.status_lock:
+                task_id = ai_manager.celery_task_id
+                if task_id:
+                    ai_manager.celery_task_id = None
+                    ai_manager.update_training_status({
+                        'status': 'stopped',
+                        'end_time': iso_now()
+                    })
+                    ai_manager.add_log("학습이 사용자에 의해 중지됨", "WARNING")
+        
+        if task_id:
+            # 브로커 호출은 잠금 밖에서 (Redis 플래그가 없으면 prefork 풀 워커에서만 실행 중 작업이 종료됨)
+            if stop_flags is not None:
+                stop_flags.set(CELERY_STOP_KEY.format(task_id=task_id), 1, ex=CELERY_STOP_TTL)
+            celery_app.control.revoke(task_id, terminate=stop_flags is None)
+            return jsonify({
+                'success': True,
+                'message': '학습이 중지되었습니다'
+            })
+        
         trainer = ai_manager.trainer
         
         if trainer and trainer.is_training:
+            # 학습 스레드 join은 잠금 밖에서 (학습 스레드의 add_log가 잠금을 기다리지 않도록)
             success = trainer.stop_training()
             
             if success:
-                ai_manager.update_training_status({
-                    'status': 'stopped',
-                    'end_time': datetime.now().isoformat()
-                })
-                ai_manager.add_log("학습이 사용자에 의해 중지됨", "WARNING")
+                with ai_manager.status_lock:
+                    ai_manager.update_training_status({
+                        'status': 'stopped',
+                        'end_time': iso_now()
+                    })
+                    ai_manager.add_log("학습이 사용자에 의해 중지됨", "WARNING")
                 
                 return jsonify({
                     'success': True,
@@ -307,28 +842,58 @@ def stop_training():
             'error': str(e)
         }), 500
 
+STATUS_MAX_WAIT = 30  # 롱폴링/스트림 최대 대기 시간 (초)
+
+# 상태 응답에 담는 필드 (로그는 /logs에서 따로 조회)
+STATUS_FIELDS = (
+    'status', 'start_time', 'end_time', 'current_epoch', 'total_epochs',
+    'accuracy', 'loss', 'val_accuracy', 'val_loss', 'model_name', 'error'
+)
+
+def build_status_payload(include_logs: bool = False) -> Dict:
+    """응답용 학습 상태 (필요한 필드만 + 진행률/경과 시간)"""
+    training_status = ai_manager.training_status
+    with ai_manager.status_lock:  # 학습 스레드의 갱신 도중 값이 섞이지 않도록
+        status = {key: training_status.get(key) for key in STATUS_FIELDS}
+        if include_logs:
+            status['logs'] = list(training_status['logs'])  # deque는 JSON 직렬화 불가
+    
+    # 진행률 계산
+    if status['total_epochs'] > 0:
+        status['progress_percentage'] = (status['current_epoch'] / status['total_epochs']) * 100
+    else:
+        status['progress_percentage'] = 0
+    
+    # 경과 시간 계산 (start_time 문자열 파싱 대신 monotonic 차이)
+    started_at = ai_manager.training_started_at
+    if started_at is not None and status['status'] == 'running':
+        elapsed_seconds = int(time.monotonic() - started_at)
+        status['elapsed_seconds'] = elapsed_seconds
+        status['elapsed_formatted'] = str(timedelta(seconds=elapsed_seconds))
+    
+    return status
+
 @app.route('/status', methods=['GET'])
 def get_training_status():
-    """학습 상태 조회"""
+    """학습 상태 조회
+    
+    wait/version 파라미터를 주면 롱폴링: 상태 버전이 version과 달라질 때까지
+    (최대 wait초) 응답을 보류해, 클라이언트가 고정 주기로 폴링하지 않아도 변경 즉시 수신
+    기본은 상태 요약만, logs=1이면 최근 메모리 로그 목록도 포함
+    """
     try:
-        # 진행률 계산
-        status = ai_manager.training_status.copy()
-        
-        if status['total_epochs'] > 0:
-            status['progress_percentage'] = (status['current_epoch'] / status['total_epochs']) * 100
+        wait = min(request.args.get('wait', 0, type=float), STATUS_MAX_WAIT)
+        since = request.args.get('version', type=int)
+        include_logs = request.args.get('logs', 0, type=int) != 0
+        if wait > 0 and since is not None:
+            version = ai_manager.wait_for_status_change(since, wait)
         else:
-            status['progress_percentage'] = 0
+            version = ai_manager.status_version
         
-        # 경과 시간 계산
-        if status['start_time'] and status['status'] == 'running':
-            start_time = datetime.fromisoformat(status['start_time'])
-            elapsed = datetime.now() - start_time
-            status['elapsed_seconds'] = int(elapsed.total_seconds())
-            status['elapsed_formatted'] = str(elapsed).split('.')[0]
-        
-        return jsonify({
+        return ojsonify({
             'success': True,
-            'status': status
+            'status': build_status_payload(include_logs),
+            'version': version
         })
         
     except Exception as e:
@@ -338,6 +903,30 @@ def get_training_status():
             'error': str(e)
         }), 500
 
+@app.route('/status/stream', methods=['GET'])
+def stream_training_status():
+    """학습 상태 스트림 (Server-Sent Events)
+    
+    연결 직후 현재 상태 1건, 이후 상태가 바뀔 때마다 1건씩 전송 (logs 제외)
+    변경이 없으면 STATUS_MAX_WAIT초마다 keepalive 주석만 전송
+    """
+    def event_stream():
+        version = -1  # 첫 대기는 즉시 반환 → 현재 상태부터 전송
+        while True:
+            current = ai_manager.wait_for_status_change(version, STATUS_MAX_WAIT)
+            if current == version:
+                yield ": keepalive\n\n"
+                continue
+            version = current
+            payload = dumps_json(build_status_payload())
+            yield f"id: {version}\ndata: {payload}\n\n"
+    
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """예측 수행"""
@@ -347,8 +936,11 @@ def predict():
         # 시장 데이터 추출
         market_data = data.get('market_data')
         if not market_data:
-            # 최신 데이터 수집
-            df = ai_manager.data_collector.get_latest_data(interval="15", limit=100)
+            # 백그라운드에서 갱신해 둔 최신 데이터 사용
+            # (아직 없거나 MARKET_MAX_AGE보다 오래됐으면 이번에 직접 수집, 실패하면 오래된 데이터로 예측하지 않음)
+            df = ai_manager.fresh_market_data()
+            if df is None:
+                df = ai_manager.fetch_market_data()
             if df is None:
                 return jsonify({
                     'success': False,
@@ -365,7 +957,7 @@ def predict():
         # 예측 수행
         prediction_result = predictor.predict(df)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'prediction': prediction_result
         })
@@ -381,30 +973,9 @@ def predict():
 def get_models():
     """모델 목록 조회"""
     try:
-        model_files = list(ai_manager.models_dir.glob("model_*.h5"))
-        models = []
-        
-        for model_file in model_files:
-            model_name = model_file.stem
-            info_file = ai_manager.models_dir / f"{model_name}_info.json"
-            
-            if info_file.exists():
-                with open(info_file, 'r') as f:
-                    info = json.load(f)
-            else:
-                info = {}
-            
-            models.append({
-                'name': model_name,
-                'created_at': info.get('created_at', model_file.stat().st_mtime),
-                'accuracy': info.get('accuracy', 0),
-                'size_mb': round(model_file.stat().st_size / 1024 / 1024, 2)
-            })
-        
-        # 최신순 정렬
-        models.sort(key=lambda x: x['created_at'], reverse=True)
+        models = list_models()
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'models': models,
             'count': len(models)
@@ -423,31 +994,47 @@ def get_model_info(model_name):
     try:
         model_file = ai_manager.models_dir / f"{model_name}.h5"
         
-        if not model_file.exists():
+        # 존재 확인과 크기/mtime 조회를 stat 한 번으로 처리
+        try:
+            model_stat = model_file.stat()
+        except FileNotFoundError:
             return jsonify({
                 'success': False,
                 'error': '모델을 찾을 수 없습니다'
             }), 404
         
         info_file = ai_manager.models_dir / f"{model_name}_info.json"
+        try:
+            info_mtime = info_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            info_mtime = 0
         
-        if info_file.exists():
+        # 파일 변경 시각/크기 기반 ETag (변경 없으면 304로 본문 생략)
+        etag = f"{model_stat.st_mtime_ns:x}-{model_stat.st_size:x}-{info_mtime:x}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        if info_mtime:
             with open(info_file, 'r') as f:
                 info = json.load(f)
         else:
             info = {'name': model_name}
         
         # 파일 크기 추가
-        info['size_mb'] = round(model_file.stat().st_size / 1024 / 1024, 2)
+        info['size_mb'] = round(model_stat.st_size / 1024 / 1024, 2)
         
         # 스케일러 파일 확인
         scaler_file = ai_manager.models_dir / f"{model_name}_scaler.pkl"
         info['has_scaler'] = scaler_file.exists()
         
-        return jsonify({
+        response = ojsonify({
             'success': True,
             'model': info
         })
+        response.set_etag(etag)
+        return response
         
     except Exception as e:
         logger.error(f"모델 정보 조회 오류: {e}")
@@ -460,23 +1047,28 @@ def get_model_info(model_name):
 def get_logs():
     """학습 로그 조회"""
     try:
-        # 쿼리 파라미터
+        # 쿼리 파라미터 (include_file=0이면 파일 로그를 읽지 않음)
         lines = request.args.get('lines', 50, type=int)
+        include_file = request.args.get('include_file', '1') != '0'
         
-        # 메모리 로그
-        memory_logs = ai_manager.training_status.get('logs', [])
+        # 메모리 로그 (deque는 이미 최대 개수로 제한됨, 요청한 끝부분만 복사)
+        with ai_manager.status_lock:  # 복사 중 add_log가 deque를 바꾸면 RuntimeError
+            log_buffer = ai_manager.training_status.get('logs', deque())
+            if lines > 0:
+                memory_logs = list(islice(reversed(log_buffer), lines))[::-1]
+            else:
+                memory_logs = list(log_buffer)
         
         # 파일 로그 (옵션)
         log_file = Path("logs/training.log")
         file_logs = []
         
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                file_logs = f.readlines()[-lines:]
+        if include_file and log_file.exists():
+            file_logs = tail_lines(log_file, lines)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
-            'memory_logs': memory_logs[-lines:],
+            'memory_logs': memory_logs,
             'file_logs': file_logs
         })
         
@@ -491,29 +1083,26 @@ def get_logs():
 def get_system_info():
     """시스템 정보"""
     try:
-        import tensorflow as tf
-        
-        # GPU 정보
-        gpus = tf.config.list_physical_devices('GPU')
+        # GPU 정보 (시작 시 조회한 값)
         gpu_info = {
-            'available': len(gpus) > 0,
-            'count': len(gpus),
-            'devices': [gpu.name for gpu in gpus]
+            'available': len(GPU_DEVICES) > 0,
+            'count': len(GPU_DEVICES),
+            'devices': GPU_DEVICES
         }
         
-        # 디스크 사용량
-        models_size = sum(f.stat().st_size for f in ai_manager.models_dir.glob("*")) if ai_manager.models_dir.exists() else 0
+        # 디스크 사용량 + 모델 수 (디렉토리가 바뀌었을 때만 다시 계산)
+        models_count, models_size = ai_manager.models_usage()
         
         system_info = {
             'gpu': gpu_info,
-            'tensorflow_version': tf.__version__,
+            'tensorflow_version': TF_VERSION,
             'models_directory': str(ai_manager.models_dir),
-            'models_count': len(list(ai_manager.models_dir.glob("model_*.h5"))),
+            'models_count': models_count,
             'storage_mb': round(models_size / 1024 / 1024, 2),
-            'server_time': datetime.now().isoformat()
+            'server_time': iso_now()
         }
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'system': system_info
         })
@@ -556,12 +1145,10 @@ if __name__ == '__main__':
     print(f"📝 로그 디렉토리: {ai_manager.logs_dir}")
     
     # TensorFlow GPU 확인
-    import tensorflow as tf
-    gpus = tf.config.list_physical_devices('GPU')
-    if gpus:
-        print(f"🎮 GPU 감지됨: {len(gpus)}개")
-        for gpu in gpus:
-            print(f"   - {gpu.name}")
+    if GPU_DEVICES:
+        print(f"🎮 GPU 감지됨: {len(GPU_DEVICES)}개")
+        for gpu_name in GPU_DEVICES:
+            print(f"   - {gpu_name}")
     else:
         print("💻 CPU 모드로 실행됩니다")
     
@@ -570,10 +1157,18 @@ if __name__ == '__main__':
     print("   POST /train         - 학습 시작")
     print("   POST /train/stop    - 학습 중지")
     print("   GET  /status        - 학습 상태")
+    print("   GET  /status/stream - 학습 상태 스트림 (SSE)")
     print("   POST /predict       - 예측 수행")
     print("   GET  /models        - 모델 목록")
     print("   GET  /system/info   - 시스템 정보")
     print("="*60)
+    if celery_app is not None:
+        print("🧵 학습 실행: Celery 워커 (gpu_training 큐)")
+    else:
+        print("🧵 학습 실행: 서버 내 백그라운드 스레드")
+    
+    ai_manager.warm_predictor()
+    ai_manager.start_data_refresher()
     
     # Flask 서버 실행
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file
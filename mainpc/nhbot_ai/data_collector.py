@@ -6,14 +6,176 @@ import numpy as np
 import pandas as pd
 import cupy as cp
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 # ❌ sqlite3 import 제거
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """numba 미설치 시 대체 데코레이터 (함수를 순수 Python으로 그대로 실행)"""
+        def decorator(func):
+            return func
+        return decorator
+
+@njit(cache=True)
+def _vpoc_loop(close, volume, window, bins):
+    """봉마다 직전 window+1개 종가를 bins개 가격대로 나눠 거래량이 가장 많은 가격대 중간값 계산
+
+    가격대 경계는 pd.cut(bins=정수)과 동일 (linspace + 첫 경계를 범위의 0.1%만큼 확장,
+    구간은 오른쪽 닫힘), 거래량이 모두 0이면 윈도우 종가 평균, 앞쪽 window개는 NaN
+    """
+    n = close.shape[0]
+    vpoc = np.full(n, np.nan)
+    hist = np.zeros(bins)
+    edges = np.empty(bins + 1)
+    
+    for i in range(window, n):
+        start = i - window
+        
+        # 윈도우 최저/최고가 (NaN 제외)
+        lo = np.inf
+        hi = -np.inf
+        price_sum = 0.0
+        count = 0
+        for j in range(start, i + 1):
+            price = close[j]
+            if price == price:
+                lo = min(lo, price)
+                hi = max(hi, price)
+                price_sum += price
+                count += 1
+        if count == 0:
+            continue
+        
+        # 가격대 경계
+        if lo == hi:
+            low_edge = lo - (0.001 * abs(lo) if lo != 0 else 0.001)
+            high_edge = hi + (0.001 * abs(hi) if hi != 0 else 0.001)
+            step = (high_edge - low_edge) / bins
+            for k in range(bins):
+                edges[k] = low_edge + k * step
+            edges[bins] = high_edge
+        else:
+            step = (hi - lo) / bins
+            for k in range(bins):
+                edges[k] = lo + k * step
+            edges[bins] = hi
+            edges[0] -= (hi - lo) * 0.001
+        
+        # 가격대별 거래량 합계
+        hist[:] = 0.0
+        for j in range(start, i + 1):
+            price = close[j]
+            vol = volume[j]
+            if price == price and vol == vol:
+                k = np.searchsorted(edges, price) - 1
+                k = min(max(k, 0), bins - 1)
+                hist[k] += vol
+        
+        best = np.argmax(hist)
+        if hist[best] > 0:
+            vpoc[i] = 0.5 * (edges[best] + edges[best + 1])
+        else:
+            vpoc[i] = price_sum / count
+    
+    return vpoc
+
+@njit(cache=True)
+def _ema(values, span):
+    """지수 이동평균 (pandas ewm(span=span).mean()과 동일: adjust=True, NaN은 건너뛰되 가중치는 감쇠)"""
+    n = values.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    
+    for i in range(1, n):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= decay
+            if cur == cur:
+                # 같은 값이면 그대로 (상수 구간에서 반올림 오차 방지, pandas와 동일)
+                if weighted != cur:
+                    weighted = (old_wt * weighted + cur) / (old_wt + 1.0)
+                old_wt += 1.0
+        elif cur == cur:
+            weighted = cur  # 앞쪽 NaN 이후 첫 관측값
+        out[i] = weighted
+    
+    return out
+
+def _rolling_mean_std(xp, values, mean_periods, std_periods=()) -> Tuple[Dict[int, np.ndarray], Dict[int, np.ndarray]]:
+    """누적합 차이로 여러 기간의 이동평균/표준편차를 한 번에 계산
+
+    xp는 numpy 또는 cupy (cupy면 GPU에서 계산 후 결과를 한 번에 CPU로 복사)
+    전체 평균만큼 옮긴 값으로 누적합을 구해 큰 가격대에서의 제곱합 상쇄 오차를 줄이고,
+    값이 모두 같은 윈도우는 pandas rolling처럼 평균=그 값, 표준편차=0으로 정확히 맞춤
+    pandas rolling과 같이 앞쪽 period-1개와 NaN이 섞인 윈도우는 NaN, 표준편차는 ddof=1
+
+    Returns:
+        ({기간: 이동평균}, {기간: 표준편차}) numpy 배열
+    """
+    raw = xp.asarray(values, dtype=xp.float64)
+    n = raw.shape[0]
+    missing = xp.isnan(raw)
+    center = float(xp.nanmean(raw)) if n and not bool(missing.all()) else 0.0
+    x = xp.where(missing, 0.0, raw - center)
+    
+    cs = xp.concatenate((xp.zeros(1), xp.cumsum(x)))
+    cs2 = xp.concatenate((xp.zeros(1), xp.cumsum(x * x)))
+    cn = xp.concatenate((xp.zeros(1, dtype=xp.int64), xp.cumsum(missing)))
+    # 직전 봉과 값이 달라진 횟수 누적 (윈도우 안에서 0이면 값이 모두 같음)
+    changed = xp.zeros(n, dtype=xp.int64)
+    changed[1:] = raw[1:] != raw[:-1]
+    cc = xp.cumsum(changed)
+    
+    periods = list(mean_periods) + list(std_periods)
+    stacked = xp.full((len(periods), n), xp.nan)
+    for row, period in enumerate(periods):
+        if n < period:
+            continue
+        window_sum = cs[period:] - cs[:-period]
+        if row < len(mean_periods):
+            stat = window_sum / period + center
+        else:
+            sq_sum = cs2[period:] - cs2[:-period]
+            stat = xp.sqrt(xp.maximum(sq_sum - window_sum * window_sum / period, 0.0) / (period - 1))
+        flat = (cc[period - 1:] - cc[:n - period + 1]) == 0
+        stat = xp.where(flat, raw[period - 1:] if row < len(mean_periods) else 0.0, stat)
+        has_nan = (cn[period:] - cn[:-period]) > 0
+        stacked[row, period - 1:] = xp.where(has_nan, xp.nan, stat)
+    
+    if xp is not np:
+        stacked = xp.asnumpy(stacked)  # 기간 수와 관계없이 GPU→CPU 복사 1회
+    
+    means = {period: stacked[row] for row, period in enumerate(mean_periods)}
+    stds = {period: stacked[len(mean_periods) + row] for row, period in enumerate(std_periods)}
+    return means, stds
+
 class DataCollector:
     """메인 PC용 데이터 수집 및 기술적 지표 계산 클래스 (GPU 최적화)"""
     
+    # 심볼별 공유 인스턴스 (GPU 확인 등 초기화 비용을 한 번만 지불)
+    _shared: Dict[str, "DataCollector"] = {}
+    _shared_lock = threading.Lock()
+    
+    # 종가 이동평균/표준편차 기간 (이동평균·볼린저·변동성 지표가 한 번 계산한 값을 공유)
+    SMA_PERIODS = (5, 10, 20, 50, 100, 200)
+    STD_PERIODS = (10, 20)  # volatility_10/20, 볼린저 밴드(20)
+    
     def __init__(
         self, 
         symbol: str = "BTCUSDT", 
@@ -22,6 +184,10 @@ class DataCollector:
         self.symbol = symbol
         self.base_url = "https://api.bybit.com/v5/market/kline"
         
+        # Bybit 연결 재사용 (페이지마다 TCP/TLS 핸드셰이크 반복 방지)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
         # ❌ SQLite 관련 코드 모두 제거 (3줄)
         # self.config_path = config_path or Path(__file__).parent.parent / 'config' / 'data_config.db'
         # self.conn = sqlite3.connect(str(self.config_path), check_same_thread=False)
@@ -41,6 +207,15 @@ class DataCollector:
         print(f"✅ DataCollector 초기화: {symbol}")
         print(f"🖥️ GPU 사용 가능: {self.gpu_available}")
     
+    @classmethod
+    def shared(cls, symbol: str = "BTCUSDT") -> "DataCollector":
+        """심볼별 공유 인스턴스 반환 (없으면 생성, 스레드 안전)"""
+        with cls._shared_lock:
+            collector = cls._shared.get(symbol)
+            if collector is None:
+                collector = cls._shared[symbol] = cls(symbol)
+            return collector
+    
     def _check_gpu_availability(self):
         """GPU 사용 가능 여부 확인"""
         try:
@@ -102,7 +277,7 @@ class DataCollector:
                     "end": str(end_time)
                 }
                 
-                response = requests.get(self.base_url, params=params, timeout=30)
+                response = self.session.get(self.base_url, params=params, timeout=30)
                 
                 if response.status_code != 200:
                     print(f"❌ API 호출 실패: {response.status_code}")
@@ -159,43 +334,54 @@ class DataCollector:
             return None
     
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """기술적 지표 계산"""
+        """기술적 지표 계산 (입력 df는 수정하지 않음)"""
         try:
             print("🔧 기술적 지표 계산 중...")
             print(f"   입력 데이터: {len(df)}개 행, {len(df.columns)}개 컬럼")
             
-            # 복사본 생성
-            result = df.copy()
+            # 새 지표는 dict에 모았다가 마지막에 한 번에 DataFrame으로 만듦
+            # (복사본에 컬럼을 하나씩 추가할 때마다 생기는 블록 통합/복사 방지)
+            indicators: Dict = {}
             
             # 1. 기본 가격 지표
             print("   1. 가격 지표 계산 중...")
-            result = self._add_price_indicators(result)
-            print(f"      → {len(result)}개 행")
+            indicators.update(self._add_price_indicators(df))
+            print(f"      → {len(indicators)}개 지표")
             
             # 2. 이동평균
             print("   2. 이동평균 계산 중...")
-            result = self._add_moving_averages(result)
-            print(f"      → {len(result)}개 행")
+            # 종가 롤링 평균/표준편차는 여기서 한 번만 계산해 이동평균·변동성 지표에 전달
+            close_stats = self._close_rolling_stats(df['close'])
+            indicators.update(self._add_moving_averages(df, close_stats))
+            print(f"      → {len(indicators)}개 지표")
             
             # 3. 모멘텀 지표
             print("   3. 모멘텀 지표 계산 중...")
-            result = self._add_momentum_indicators(result)
-            print(f"      → {len(result)}개 행")
+            indicators.update(self._add_momentum_indicators(df))
+            print(f"      → {len(indicators)}개 지표")
             
             # 4. 변동성 지표
             print("   4. 변동성 지표 계산 중...")
-            result = self._add_volatility_indicators(result)
-            print(f"      → {len(result)}개 행")
+            indicators.update(self._add_volatility_indicators(df, close_stats))
+            print(f"      → {len(indicators)}개 지표")
             
             # 5. 거래량 지표
             print("   5. 거래량 지표 계산 중...")
-            result = self._add_volume_indicators(result)
-            print(f"      → {len(result)}개 행")
+            indicators.update(self._add_volume_indicators(df))
+            print(f"      → {len(indicators)}개 지표")
             
             # 6. 추가 지표들
             print("   6. 추가 지표 계산 중...")
-            result = self._add_additional_indicators(result)
-            print(f"      → {len(result)}개 행")
+            indicators.update(self._add_additional_indicators(df))
+            print(f"      → {len(indicators)}개 지표")
+            
+            # 파생 지표 컬럼은 float32로 보관 (계산은 누적합 정밀도 때문에 float64로 하고 저장만 축소,
+            # 학습/예측 입력이 어차피 float32라 값 손실 없이 메모리·이후 fill 처리량 절반)
+            # 원본 OHLCV 등 입력 컬럼은 라벨 계산용으로 float64 유지
+            # Series는 기존 df[col] = ... 할당과 같이 인덱스 기준으로 맞춰 들어감
+            indicator_frame = pd.DataFrame(indicators, index=df.index).astype(np.float32)
+            # 같은 이름의 기존 컬럼(이미 지표가 붙은 df 재계산 시)은 새 값으로 대체
+            result = pd.concat([df.drop(columns=indicator_frame.columns, errors='ignore'), indicator_frame], axis=1)
             
             # NaN 처리
             print(f"   NaN 처리 전: {len(result)}개 행")
@@ -222,75 +408,91 @@ class DataCollector:
             traceback.print_exc()
             return df
     
-    def _add_price_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_price_indicators(self, df: pd.DataFrame) -> Dict:
         """가격 관련 지표"""
+        out = {}
         # 가격 변화율
-        df['price_change'] = df['close'].pct_change()
-        df['price_change_abs'] = df['price_change'].abs()
+        out['price_change'] = df['close'].pct_change()
+        out['price_change_abs'] = out['price_change'].abs()
         
         # 고가-저가 범위
-        df['hl_range'] = (df['high'] - df['low']) / df['close']
-        df['oc_range'] = abs(df['open'] - df['close']) / df['close']
+        out['hl_range'] = (df['high'] - df['low']) / df['close']
+        out['oc_range'] = abs(df['open'] - df['close']) / df['close']
         
         # 전일 대비
-        df['prev_close'] = df['close'].shift(1)
-        df['gap'] = (df['open'] - df['prev_close']) / df['prev_close']
+        out['prev_close'] = df['close'].shift(1)
+        out['gap'] = (df['open'] - out['prev_close']) / out['prev_close']
         
-        return df
+        return out
+    
+    def _close_rolling_stats(self, close: pd.Series) -> Tuple[Dict[int, np.ndarray], Dict[int, np.ndarray]]:
+        """SMA_PERIODS 이동평균 + STD_PERIODS 표준편차 ({기간: 배열}, {기간: 배열})
+
+        모든 기간을 누적합 한 번으로 계산 (GPU가 있으면 GPU에서, 결과 복사도 1회)
+        """
+        return self._rolling_mean_std(close, self.SMA_PERIODS, self.STD_PERIODS)
     
-    def _add_moving_averages(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _rolling_mean_std(self, series: pd.Series, mean_periods, std_periods=()) -> Tuple[Dict[int, np.ndarray], Dict[int, np.ndarray]]:
+        """누적합 기반 롤링 평균/표준편차 (GPU 사용 가능 여부에 따라 cupy/numpy 선택)"""
+        xp = cp if self.gpu_available else np
+        return _rolling_mean_std(xp, series.to_numpy(), mean_periods, std_periods)
+    
+    def _add_moving_averages(self, df: pd.DataFrame, close_stats: Optional[Tuple[Dict, Dict]] = None) -> Dict:
         """이동평균 지표"""
-        periods = [5, 10, 20, 50, 100, 200]
+        out = {}
+        smas, _ = close_stats or self._close_rolling_stats(df['close'])
+        close = df['close'].to_numpy(dtype=np.float64)
         
-        for period in periods:
+        for period in self.SMA_PERIODS:
             # 단순 이동평균
-            df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
+            out[f'sma_{period}'] = smas[period]
             
             # 지수 이동평균
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+            out[f'ema_{period}'] = _ema(close, period)
             
             # 이동평균 대비 위치
-            df[f'close_vs_sma_{period}'] = (df['close'] - df[f'sma_{period}']) / df[f'sma_{period}']
-            df[f'close_vs_ema_{period}'] = (df['close'] - df[f'ema_{period}']) / df[f'ema_{period}']
+            out[f'close_vs_sma_{period}'] = (df['close'] - out[f'sma_{period}']) / out[f'sma_{period}']
+            out[f'close_vs_ema_{period}'] = (df['close'] - out[f'ema_{period}']) / out[f'ema_{period}']
         
         # 이동평균 기울기
-        df['sma_20_slope'] = df['sma_20'].pct_change(5)
-        df['ema_20_slope'] = df['ema_20'].pct_change(5)
+        out['sma_20_slope'] = pd.Series(out['sma_20'], index=df.index).pct_change(5)
+        out['ema_20_slope'] = pd.Series(out['ema_20'], index=df.index).pct_change(5)
         
-        return df
+        return out
     
-    def _add_momentum_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_momentum_indicators(self, df: pd.DataFrame) -> Dict:
         """모멘텀 지표"""
+        out = {}
         
         # RSI
-        df['rsi_14'] = self._calculate_rsi(df['close'], 14)
-        df['rsi_30'] = self._calculate_rsi(df['close'], 30)
+        out['rsi_14'] = self._calculate_rsi(df['close'], 14)
+        out['rsi_30'] = self._calculate_rsi(df['close'], 30)
         
         # MACD
         macd, macd_signal, macd_hist = self._calculate_macd(df['close'])
-        df['macd'] = macd
-        df['macd_signal'] = macd_signal
-        df['macd_histogram'] = macd_hist
+        out['macd'] = macd
+        out['macd_signal'] = macd_signal
+        out['macd_histogram'] = macd_hist
         
         # 스토캐스틱
-        df['stoch_k'], df['stoch_d'] = self._calculate_stochastic(df, 14, 3)
+        out['stoch_k'], out['stoch_d'] = self._calculate_stochastic(df, 14, 3)
         
         # Williams %R
-        df['williams_r'] = self._calculate_williams_r(df, 14)
+        out['williams_r'] = self._calculate_williams_r(df, 14)
         
         # ROC (Rate of Change)
-        df['roc_10'] = ((df['close'] - df['close'].shift(10)) / df['close'].shift(10)) * 100
-        df['roc_20'] = ((df['close'] - df['close'].shift(20)) / df['close'].shift(20)) * 100
+        out['roc_10'] = ((df['close'] - df['close'].shift(10)) / df['close'].shift(10)) * 100
+        out['roc_20'] = ((df['close'] - df['close'].shift(20)) / df['close'].shift(20)) * 100
         
         # ADX (추세 강도)
-        df['adx'] = self._calculate_adx(df, period=14)
-        df['adx_slope'] = df['adx'].diff(5)  # ADX 기울기
+        out['adx'] = self._calculate_adx(df, period=14)
+        out['adx_slope'] = out['adx'].diff(5)  # ADX 기울기
         
         # Aroon (추세 전환 타이밍)
-        df['aroon_up'], df['aroon_down'] = self._calculate_aroon(df, period=25)
-        df['aroon_oscillator'] = df['aroon_up'] - df['aroon_down']
+        out['aroon_up'], out['aroon_down'] = self._calculate_aroon(df, period=25)
+        out['aroon_oscillator'] = out['aroon_up'] - out['aroon_down']
         
-        return df
+        return out
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI 계산"""
@@ -302,10 +504,9 @@ class DataCollector:
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """MACD 계산"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
+        values = prices.to_numpy(dtype=np.float64)
+        macd = pd.Series(_ema(values, fast) - _ema(values, slow), index=prices.index)
+        macd_signal = pd.Series(_ema(macd.to_numpy(), signal), index=prices.index)
         macd_histogram = macd - macd_signal
         return macd, macd_signal, macd_histogram
     
@@ -351,68 +552,87 @@ class DataCollector:
         return adx
     
     def _calculate_aroon(self, df: pd.DataFrame, period: int = 25) -> Tuple[pd.Series, pd.Series]:
-        """Aroon Indicator 계산"""
-        aroon_up = df['high'].rolling(window=period).apply(
-            lambda x: (period - x.argmax()) / period * 100
-        )
-        aroon_down = df['low'].rolling(window=period).apply(
-            lambda x: (period - x.argmin()) / period * 100
-        )
+        """Aroon Indicator 계산 (슬라이딩 윈도우 뷰에서 argmax/argmin 한 번씩)"""
+        def aroon(values: np.ndarray, use_max: bool) -> np.ndarray:
+            out = np.full(len(values), np.nan)
+            if len(values) >= period:
+                windows = np.lib.stride_tricks.sliding_window_view(values, period)
+                pos = windows.argmax(axis=1) if use_max else windows.argmin(axis=1)
+                result = (period - pos) / period * 100
+                # NaN이 섞인 윈도우는 rolling과 동일하게 NaN
+                result[np.isnan(windows).any(axis=1)] = np.nan
+                out[period - 1:] = result
+            return out
+        
+        aroon_up = pd.Series(aroon(df['high'].to_numpy(dtype=float), True), index=df.index)
+        aroon_down = pd.Series(aroon(df['low'].to_numpy(dtype=float), False), index=df.index)
         return aroon_up, aroon_down
 
-    def _add_volatility_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_volatility_indicators(self, df: pd.DataFrame, close_stats: Optional[Tuple[Dict, Dict]] = None) -> Dict:
         """변동성 지표"""
-        
-        # 볼린저 밴드
-        bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(df['close'])
-        df['bb_upper'] = bb_upper
-        df['bb_middle'] = bb_middle
-        df['bb_lower'] = bb_lower
-        df['bb_width'] = (bb_upper - bb_lower) / bb_middle
-        df['bb_position'] = (df['close'] - bb_lower) / (bb_upper - bb_lower)
+        out = {}
+        means, stds = close_stats or self._close_rolling_stats(df['close'])
+        
+        # 볼린저 밴드 (20봉 평균/표준편차는 sma_20, volatility_20과 공유)
+        bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(
+            df['close'],
+            middle=pd.Series(means[20], index=df.index),
+            std=pd.Series(stds[20], index=df.index)
+        )
+        out['bb_upper'] = bb_upper
+        out['bb_middle'] = bb_middle
+        out['bb_lower'] = bb_lower
+        out['bb_width'] = (bb_upper - bb_lower) / bb_middle
+        out['bb_position'] = (df['close'] - bb_lower) / (bb_upper - bb_lower)
         
         # ATR (Average True Range)
-        df['atr'] = self._calculate_atr(df)
+        out['atr'] = self._calculate_atr(df)
         
         # 변동성 (표준편차)
-        df['volatility_10'] = df['close'].rolling(window=10).std()
-        df['volatility_20'] = df['close'].rolling(window=20).std()
+        out['volatility_10'] = stds[10]
+        out['volatility_20'] = stds[20]
         
         # Keltner Channel
         kc_upper, kc_middle, kc_lower = self._calculate_keltner_channel(df)
-        df['kc_upper'] = kc_upper
-        df['kc_middle'] = kc_middle
-        df['kc_lower'] = kc_lower
-        df['kc_position'] = (df['close'] - kc_lower) / (kc_upper - kc_lower)
+        out['kc_upper'] = kc_upper
+        out['kc_middle'] = kc_middle
+        out['kc_lower'] = kc_lower
+        out['kc_position'] = (df['close'] - kc_lower) / (kc_upper - kc_lower)
         
         # Donchian Channel
         dc_upper, dc_middle, dc_lower = self._calculate_donchian_channel(df)
-        df['dc_upper'] = dc_upper
-        df['dc_middle'] = dc_middle
-        df['dc_lower'] = dc_lower
-        df['dc_position'] = (df['close'] - dc_lower) / (dc_upper - dc_lower)
+        out['dc_upper'] = dc_upper
+        out['dc_middle'] = dc_middle
+        out['dc_lower'] = dc_lower
+        out['dc_position'] = (df['close'] - dc_lower) / (dc_upper - dc_lower)
         
-        return df
+        return out
 
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: int = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
-        """볼린저 밴드 계산"""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: int = 2,
+                                   middle: Optional[pd.Series] = None,
+                                   std: Optional[pd.Series] = None) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """볼린저 밴드 계산 (이미 계산한 period 이동평균/표준편차가 있으면 재사용)"""
+        if middle is None or std is None:
+            means, stds = self._rolling_mean_std(prices, [period], [period])
+            middle = pd.Series(means[period], index=prices.index)
+            std = pd.Series(stds[period], index=prices.index)
         upper = middle + (std * std_dev)
         lower = middle - (std * std_dev)
         return upper, middle, lower
     
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """ATR 계산"""
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift(1))
-        low_close = abs(df['low'] - df['close'].shift(1))
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        return true_range.rolling(window=period).mean()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        prev_close = df['close'].shift(1).to_numpy(dtype=np.float64)
+
+        # N×3 DataFrame 없이 배열 단위 max (fmax: 첫 봉의 NaN 무시 → 기존 max(axis=1)와 동일)
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return pd.Series(true_range, index=df.index).rolling(window=period).mean()
     
     def _calculate_keltner_channel(self, df: pd.DataFrame, period: int = 20, multiplier: float = 2.0) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Keltner Channel 계산 (ATR 기반)"""
-        middle = df['close'].ewm(span=period).mean()
+        middle = pd.Series(_ema(df['close'].to_numpy(dtype=np.float64), period), index=df.index)
         atr = self._calculate_atr(df, period)
         upper = middle + (atr * multiplier)
         lower = middle - (atr * multiplier)
@@ -425,37 +645,39 @@ class DataCollector:
         middle = (upper + lower) / 2
         return upper, middle, lower
     
-    def _add_volume_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_volume_indicators(self, df: pd.DataFrame) -> Dict:
         """거래량 지표"""
+        out = {}
         
         # 거래량 이동평균
-        df['volume_sma_10'] = df['volume'].rolling(window=10).mean()
-        df['volume_sma_20'] = df['volume'].rolling(window=20).mean()
+        volume_smas, _ = self._rolling_mean_std(df['volume'], [10, 20])
+        out['volume_sma_10'] = volume_smas[10]
+        out['volume_sma_20'] = volume_smas[20]
         
         # 상대 거래량
-        df['volume_ratio'] = df['volume'] / df['volume_sma_20']
+        out['volume_ratio'] = df['volume'] / out['volume_sma_20']
         
         # VWAP (Volume Weighted Average Price)
-        df['vwap'] = self._calculate_vwap(df)
+        out['vwap'] = self._calculate_vwap(df)
         
         # OBV (On Balance Volume)
-        df['obv'] = self._calculate_obv(df)
+        out['obv'] = self._calculate_obv(df)
         
         # CVD (Cumulative Volume Delta)
-        df['cvd'] = self._calculate_cvd(df)
-        df['cvd_slope'] = df['cvd'].diff(10)
+        out['cvd'] = self._calculate_cvd(df)
+        out['cvd_slope'] = out['cvd'].diff(10)
         
         # MFI (Money Flow Index)
-        df['mfi'] = self._calculate_mfi(df, period=14)
+        out['mfi'] = self._calculate_mfi(df, period=14)
         
         # VPOC (Volume Point of Control)
-        df['vpoc'] = self._calculate_vpoc(df, window=50)
-        df['vpoc_distance'] = (df['close'] - df['vpoc']) / df['close'] * 100
+        out['vpoc'] = self._calculate_vpoc(df, window=50)
+        out['vpoc_distance'] = (df['close'] - out['vpoc']) / df['close'] * 100
         
         # Order Flow Imbalance
-        df['order_flow_imbalance'] = self._calculate_order_flow_imbalance(df)
+        out['order_flow_imbalance'] = self._calculate_order_flow_imbalance(df)
         
-        return df
+        return out
     
     def _calculate_vwap(self, df: pd.DataFrame) -> pd.Series:
         """VWAP 계산 (당일 기준)"""
@@ -464,19 +686,19 @@ class DataCollector:
         return vwap
     
     def _calculate_obv(self, df: pd.DataFrame) -> pd.Series:
-        """OBV 계산"""
-        obv = pd.Series(index=df.index, dtype=float)
-        obv.iloc[0] = df['volume'].iloc[0]
-        
-        for i in range(1, len(df)):
-            if df['close'].iloc[i] > df['close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + df['volume'].iloc[i]
-            elif df['close'].iloc[i] < df['close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - df['volume'].iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv
+        """OBV 계산 (봉마다 ±거래량을 만든 뒤 누적합 한 번)"""
+        close = df['close'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        if len(close) == 0:
+            return pd.Series(index=df.index, dtype=float)
+        
+        # 상승 +거래량, 하락 -거래량, 보합(NaN 비교 포함) 0
+        prev, curr = close[:-1], close[1:]
+        delta = np.empty_like(volume)
+        delta[0] = volume[0]
+        delta[1:] = np.where(curr > prev, volume[1:], np.where(curr < prev, -volume[1:], 0.0))
+        
+        return pd.Series(np.cumsum(delta), index=df.index)
     
     def _calculate_cvd(self, df: pd.DataFrame) -> pd.Series:
         """Cumulative Volume Delta 계산"""
@@ -500,25 +722,16 @@ class DataCollector:
         return mfi
     
     def _calculate_vpoc(self, df: pd.DataFrame, window: int = 50) -> pd.Series:
-        """VPOC (Volume Point of Control) 계산"""
-        vpoc = pd.Series(index=df.index, dtype=float)
-        
-        for i in range(window, len(df)):
-            # 윈도우 내 데이터
-            window_data = df.iloc[i-window:i+1]
-            
-            # 가격 구간을 20개로 나누기
-            price_bins = pd.cut(window_data['close'], bins=20)
-            
-            # 각 가격대별 거래량 합계
-            volume_profile = window_data.groupby(price_bins)['volume'].sum()
-            
-            # 가장 많은 거래량이 발생한 가격대의 중간값
-            if len(volume_profile) > 0 and volume_profile.max() > 0:
-                max_volume_bin = volume_profile.idxmax()
-                vpoc.iloc[i] = max_volume_bin.mid
-            else:
-                vpoc.iloc[i] = window_data['close'].mean()
+        """VPOC (Volume Point of Control) 계산 (윈도우별 히스토그램은 _vpoc_loop에서)"""
+        vpoc = pd.Series(
+            _vpoc_loop(
+                df['close'].to_numpy(dtype=np.float64),
+                df['volume'].to_numpy(dtype=np.float64),
+                window,
+                20  # 가격 구간 수
+            ),
+            index=df.index
+        )
         
         # 초기값은 평균으로 채우기
         vpoc.fillna(df['close'].rolling(window).mean(), inplace=True)
@@ -551,98 +764,84 @@ class DataCollector:
         
         return pd.Series(imbalance, index=df.index)
     
-    def _add_additional_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_additional_indicators(self, df: pd.DataFrame) -> Dict:
         """추가 지표들"""
+        out = {}
         
         # 연속 상승/하락
-        df['consecutive_up'] = self._calculate_consecutive(df['close'] > df['close'].shift(1))
-        df['consecutive_down'] = self._calculate_consecutive(df['close'] < df['close'].shift(1))
+        out['consecutive_up'] = self._calculate_consecutive(df['close'] > df['close'].shift(1))
+        out['consecutive_down'] = self._calculate_consecutive(df['close'] < df['close'].shift(1))
         
         # 최고점/최저점 이후 기간
-        df['bars_since_high'] = self._bars_since_extreme(df['high'], 'max')
-        df['bars_since_low'] = self._bars_since_extreme(df['low'], 'min')
+        out['bars_since_high'] = self._bars_since_extreme(df['high'], 'max')
+        out['bars_since_low'] = self._bars_since_extreme(df['low'], 'min')
         
         # 시간 특성 (시간대별 패턴)
-        df['hour'] = df.index.hour
-        df['day_of_week'] = df.index.dayofweek
+        out['hour'] = df.index.hour
+        out['day_of_week'] = df.index.dayofweek
         
         # 다중 시간대 분석 (15분봉 기준)
-        df['1h_trend'] = df['close'].rolling(4).mean().diff(4) > 0  # 1시간 추세
-        df['4h_trend'] = df['close'].rolling(16).mean().diff(16) > 0  # 4시간 추세
-        df['trend_alignment'] = (df['1h_trend'] == df['4h_trend']).astype(int)
+        out['1h_trend'] = df['close'].rolling(4).mean().diff(4) > 0  # 1시간 추세
+        out['4h_trend'] = df['close'].rolling(16).mean().diff(16) > 0  # 4시간 추세
+        out['trend_alignment'] = (out['1h_trend'] == out['4h_trend']).astype(int)
         
         # 고점/저점 갱신 카운터
-        df['higher_highs'] = self._count_higher_highs(df, window=10)
-        df['lower_lows'] = self._count_lower_lows(df, window=10)
-        df['trend_strength'] = df['higher_highs'] - df['lower_lows']
+        out['higher_highs'] = self._count_higher_highs(df, window=10)
+        out['lower_lows'] = self._count_lower_lows(df, window=10)
+        out['trend_strength'] = out['higher_highs'] - out['lower_lows']
         
         # Z-score (평균 회귀)
-        df['zscore_20'] = self._calculate_zscore(df['close'], window=20)
-        df['zscore_50'] = self._calculate_zscore(df['close'], window=50)
+        out['zscore_20'] = self._calculate_zscore(df['close'], window=20)
+        out['zscore_50'] = self._calculate_zscore(df['close'], window=50)
         
         # Pivot Points (지지/저항)
-        df['pivot'], df['resistance1'], df['support1'], df['resistance2'], df['support2'] = self._calculate_pivot_points(df)
-        df['pivot_position'] = (df['close'] - df['pivot']) / df['close'] * 100
+        out['pivot'], out['resistance1'], out['support1'], out['resistance2'], out['support2'] = self._calculate_pivot_points(df)
+        out['pivot_position'] = (df['close'] - out['pivot']) / df['close'] * 100
         
         # Market Structure Break (시장 구조 변화)
-        df['market_structure_break'] = self._calculate_market_structure_break(df)
-        df['ms_break_strength'] = df['market_structure_break'].rolling(10).sum()
+        out['market_structure_break'] = self._calculate_market_structure_break(df)
+        out['ms_break_strength'] = out['market_structure_break'].rolling(10).sum()
         
-        return df
+        return out
     
     def _calculate_consecutive(self, condition: pd.Series) -> pd.Series:
-        """연속 조건 만족 횟수 계산"""
-        consecutive = pd.Series(0, index=condition.index)
-        count = 0
+        """연속 조건 만족 횟수 계산 (마지막으로 조건이 깨진 위치까지의 거리)"""
+        satisfied = condition.to_numpy(dtype=bool)
+        positions = np.arange(len(satisfied))
         
-        for i, val in enumerate(condition):
-            if val:
-                count += 1
-            else:
-                count = 0
-            consecutive.iloc[i] = count
+        # 조건이 깨진(False) 봉의 위치를 앞으로 전파 → 현재 위치와의 차이가 연속 횟수
+        last_reset = np.maximum.accumulate(np.where(satisfied, -1, positions))
         
-        return consecutive
+        return pd.Series(positions - last_reset, index=condition.index)
     
     def _bars_since_extreme(self, series: pd.Series, extreme_type: str, window: int = 50) -> pd.Series:
-        """최고점/최저점 이후 경과 기간"""
-        result = pd.Series(0, index=series.index)
-        
-        for i in range(window, len(series)):
-            window_data = series.iloc[i-window:i+1]
-            if extreme_type == 'max':
-                extreme_idx = window_data.idxmax()
-            else:
-                extreme_idx = window_data.idxmin()
+        """최고점/최저점 이후 경과 기간 (현재 봉 포함 window+1개 구간, 앞쪽 window개는 0)"""
+        result = np.zeros(len(series), dtype=np.int64)
+        if len(series) > window:
+            # NaN은 극값 후보에서 제외 (idxmax/idxmin의 skipna와 동일)
+            fill = -np.inf if extreme_type == 'max' else np.inf
+            values = np.nan_to_num(series.to_numpy(dtype=float), nan=fill)
             
-            bars_since = i - window_data.index.get_loc(extreme_idx)
-            result.iloc[i] = bars_since
+            # (N-window, window+1) 슬라이딩 뷰에서 한 번에 극값 위치 계산 (복사 없음)
+            windows = np.lib.stride_tricks.sliding_window_view(values, window + 1)
+            extreme_pos = windows.argmax(axis=1) if extreme_type == 'max' else windows.argmin(axis=1)
+            result[window:] = window - extreme_pos
         
-        return result
+        return pd.Series(result, index=series.index)
     
     def _count_higher_highs(self, df: pd.DataFrame, window: int = 10) -> pd.Series:
-        """연속 고점 갱신 카운터"""
-        result = pd.Series(0, index=df.index)
-        
-        for i in range(window, len(df)):
-            count = 0
-            for j in range(i-window+1, i+1):
-                if j > 0 and df['high'].iloc[j] > df['high'].iloc[j-1]:
-                    count += 1
-            result.iloc[i] = count
+        """연속 고점 갱신 카운터 (최근 window봉 중 직전 봉보다 고가가 높았던 횟수)"""
+        higher = (df['high'].diff() > 0).astype(np.int64)
+        result = higher.rolling(window).sum().fillna(0).astype(np.int64)
+        result.iloc[:window] = 0  # 앞쪽 window개는 0
         
         return result
     
     def _count_lower_lows(self, df: pd.DataFrame, window: int = 10) -> pd.Series:
-        """연속 저점 갱신 카운터"""
-        result = pd.Series(0, index=df.index)
-        
-        for i in range(window, len(df)):
-            count = 0
-            for j in range(i-window+1, i+1):
-                if j > 0 and df['low'].iloc[j] < df['low'].iloc[j-1]:
-                    count += 1
-            result.iloc[i] = count
+        """연속 저점 갱신 카운터 (최근 window봉 중 직전 봉보다 저가가 낮았던 횟수)"""
+        lower = (df['low'].diff() < 0).astype(np.int64)
+        result = lower.rolling(window).sum().fillna(0).astype(np.int64)
+        result.iloc[:window] = 0  # 앞쪽 window개는 0
         
         return result
     
@@ -669,23 +868,17 @@ class DataCollector:
         return pivot, resistance1, support1, resistance2, support2
     
     def _calculate_market_structure_break(self, df: pd.DataFrame, window: int = 20) -> pd.Series:
-        """Market Structure Break 계산"""
-        result = pd.Series(0, index=df.index)
-        
-        for i in range(window, len(df)):
-            # 이전 고점/저점
-            prev_high = df['high'].iloc[i-window:i].max()
-            prev_low = df['low'].iloc[i-window:i].min()
-            
-            # 구조 돌파 체크
-            if df['close'].iloc[i] > prev_high:
-                result.iloc[i] = 1  # 상승 돌파
-            elif df['close'].iloc[i] < prev_low:
-                result.iloc[i] = -1  # 하락 돌파
-            else:
-                result.iloc[i] = 0  # 횡보
+        """Market Structure Break 계산 (1: 상승 돌파, -1: 하락 돌파, 0: 횡보)"""
+        # 이전 window봉 고점/저점 (shift(1)로 현재 봉 제외, min_periods=1로 NaN은 건너뜀)
+        prev_high = df['high'].shift(1).rolling(window, min_periods=1).max()
+        prev_low = df['low'].shift(1).rolling(window, min_periods=1).min()
         
-        return result
+        # 구조 돌파 체크
+        close = df['close']
+        result = np.where(close > prev_high, 1, np.where(close < prev_low, -1, 0)).astype(np.int64)
+        result[:window] = 0  # 이전 구간이 window봉 미만이면 판단하지 않음
+        
+        return pd.Series(result, index=df.index)
     
     def save_data(self, df: pd.DataFrame, filename: str = None) -> bool:
         """데이터 저장"""
@@ -720,7 +913,7 @@ class DataCollector:
                 "limit": str(limit)
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             
             if response.status_code != 200:
                 return None
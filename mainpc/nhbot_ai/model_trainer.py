@@ -8,18 +8,40 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
 from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedShuffleSplit
+from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.utils.class_weight import compute_class_weight
+import io
+import os
 import pickle
 import json
 from datetime import datetime
 from pathlib import Path
 import threading
 import time
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple, Callable
 
+from .scaler import FastMinMaxScaler
+from .windower import gather_windows
+
+# 학습 데이터 Parquet 캐시 위치 (작업 디렉토리와 무관한 절대 경로, 모델 디렉토리 하위)
+TRAINING_CACHE_DIR = Path(os.environ.get("TRAINING_CACHE_DIR", "/app/models/cache"))
+
+@dataclass(frozen=True)
+class TrainingSnapshot:
+    """학습 상태 스냅샷 (불변 객체 → 조회 시 복사/잠금 불필요)"""
+    status: str = "idle"  # idle, running, completed, failed, stopped
+    current_epoch: int = 0
+    total_epochs: int = 0
+    current_batch: int = 0
+    total_batches: int = 0
+    loss: float = 0.0
+    accuracy: float = 0.0
+    val_loss: float = 0.0
+    val_accuracy: float = 0.0
+    start_time: Optional[datetime] = field(default=None, compare=False)
+
 class ModelTrainer:
     """AI 모델 학습 클래스 (3-클래스: none/long/short)"""
     
@@ -29,21 +51,14 @@ class ModelTrainer:
         # 학습 상태 관리
         self.is_training = False
         self.training_thread = None
-        self.training_status = {
-            "status": "idle",  # idle, running, completed, failed
-            "current_epoch": 0,
-            "total_epochs": 0,
-            "current_batch": 0,
-            "total_batches": 0,
-            "metrics": {
-                "loss": 0.0,
-                "accuracy": 0.0,
-                "val_loss": 0.0,
-                "val_accuracy": 0.0
-            },
-            "start_time": None,
-            "progress_callback": None
-        }
+        self.strategy = None  # tf.distribute 전략 (학습 시작 시 결정)
+        
+        # 상태는 불변 스냅샷 참조 하나로 공개 (쓰기는 잠금 하에 교체, 읽기는 참조 한 번)
+        self._status_lock = threading.Lock()
+        self._status = TrainingSnapshot()
+        self.progress_callback = None
+        # 에폭 시작/종료, 학습 종료 시 set (상태를 가져가는 쪽이 주기 폴링 없이 대기)
+        self.epoch_event = threading.Event()
         
         # 🆕 MACD 제외한 필수 지표
         self.essential_indicators = {
@@ -98,16 +113,14 @@ class ModelTrainer:
         
         try:
             # 학습 상태 초기화
-            self.training_status = {
-                "status": "running",
-                "current_epoch": 0,
-                "total_epochs": training_params.get("epochs", 100),
-                "current_batch": 0,
-                "total_batches": 0,
-                "metrics": {"loss": 0.0, "accuracy": 0.0, "val_loss": 0.0, "val_accuracy": 0.0},
-                "start_time": datetime.now(),
-                "progress_callback": progress_callback
-            }
+            self.progress_callback = progress_callback
+            self.epoch_event.clear()
+            with self._status_lock:
+                self._status = TrainingSnapshot(
+                    status="running",
+                    total_epochs=training_params.get("epochs", 100),
+                    start_time=datetime.now()
+                )
             
             # 백그라운드 스레드에서 학습 실행
             self.training_thread = threading.Thread(
@@ -124,7 +137,7 @@ class ModelTrainer:
             
         except Exception as e:
             print(f"❌ 학습 시작 실패: {e}")
-            self.training_status["status"] = "failed"
+            self._update_status(status="failed")
             return False
     
     def stop_training(self) -> bool:
@@ -134,7 +147,8 @@ class ModelTrainer:
         
         try:
             self.is_training = False
-            self.training_status["status"] = "stopped"
+            self._update_status(status="stopped")
+            self.epoch_event.set()
             
             if self.training_thread and self.training_thread.is_alive():
                 self.training_thread.join(timeout=5)
@@ -146,9 +160,14 @@ class ModelTrainer:
             print(f"❌ 학습 중지 실패: {e}")
             return False
     
-    def get_training_status(self) -> Dict:
-        """현재 학습 상태 조회"""
-        return self.training_status.copy()
+    def get_training_status(self) -> TrainingSnapshot:
+        """현재 학습 상태 조회 (불변 스냅샷이므로 복사 없이 반환)"""
+        return self._status
+    
+    def _update_status(self, **changes):
+        """학습 상태 갱신 (새 스냅샷으로 원자적 교체)"""
+        with self._status_lock:
+            self._status = replace(self._status, **changes)
     
     def _train_model_async(self, selected_indicators: Dict[str, bool], training_params: Dict):
         """비동기 학습 실행 (내부 메서드)"""
@@ -156,15 +175,11 @@ class ModelTrainer:
             print("📊 데이터 수집 시작...")
             self._update_progress_callback("데이터 수집 중...")
             
-            # 스레드 내부에서 DataCollector 생성
-            from .data_collector import DataCollector
-            data_collector = DataCollector(self.symbol)
-            
-            # 1. 데이터 수집
+            # 1. 데이터 수집 (같은 날 같은 설정이면 디스크 캐시 재사용)
             training_days = training_params.get("training_days", 1825)
             interval = training_params.get("interval", "15")
             
-            df = data_collector.collect_historical_data(interval=interval, days=training_days)
+            df = self._load_training_data(interval, training_days)
             if df is None or len(df) < 1000:
                 raise Exception("충분한 학습 데이터를 수집할 수 없습니다.")
             
@@ -181,19 +196,21 @@ class ModelTrainer:
             print("📈 학습 데이터 준비 중...")
             X, y, scaler = self._prepare_training_data(feature_data, labels, training_params)
             
-            # 5. 🆕 3-클래스 모델 구성
+            # 5. 🆕 3-클래스 모델 구성 (GPU 2개 이상이면 데이터 병렬)
             print("🧠 모델 구성 중...")
-            model = self._build_model_3class(X.shape, training_params)
+            self.strategy = self._get_distribute_strategy()
+            with self.strategy.scope():
+                model = self._build_model_3class(X.shape, training_params)
             
             # 6. 학습 실행
             print("🚀 모델 학습 시작...")
             self._update_progress_callback("모델 학습 중...")
             
-            history = self._train_with_progress(model, X, y, training_params)
+            history, X_val, y_val = self._train_with_progress(model, X, y, training_params)
             
-            # 7. 모델 평가
+            # 7. 모델 평가 (학습에 쓰지 않은 검증 데이터만 사용)
             print("📊 모델 평가 중...")
-            accuracy = self._evaluate_model_3class(model, X, y)
+            accuracy = self._evaluate_model_3class(model, X_val, y_val)
             
             # 8. 모델 저장
             print("💾 모델 저장 중...")
@@ -206,10 +223,15 @@ class ModelTrainer:
             info_path = Path("models") / f"{model_name}_info.json"
             
             model_path.parent.mkdir(exist_ok=True)
-            model.save(str(model_path))
+            # 숨김 임시 파일에 저장 후 교체 (모델 목록/예측기가 쓰다 만 .h5를 읽지 않도록)
+            tmp_model_path = model_path.with_name(f".{model_path.name}.tmp")
+            model.save(str(tmp_model_path), save_format='h5')
+            os.replace(tmp_model_path, model_path)
             
-            with open(scaler_path, 'wb') as f:
-                pickle.dump(scaler, f)
+            # 최신 프로토콜로 메모리에서 직렬화 후 한 번에 기록
+            buffer = io.BytesIO()
+            pickle.dump(scaler, buffer, protocol=pickle.HIGHEST_PROTOCOL)
+            scaler_path.write_bytes(buffer.getbuffer())
             
             # 학습 정보 저장
             training_info = {
@@ -219,7 +241,7 @@ class ModelTrainer:
                 "accuracy": float(accuracy),
                 "parameters": training_params,
                 "indicators": selected_indicators,
-                "training_duration": (datetime.now() - self.training_status["start_time"]).total_seconds(),
+                "training_duration": (datetime.now() - self._status.start_time).total_seconds(),
                 "feature_columns": list(feature_data.columns),
                 "data_shape": [int(x) for x in X.shape],
                 "created_at": datetime.now().isoformat(),
@@ -229,9 +251,11 @@ class ModelTrainer:
             with open(info_path, 'w') as f:
                 json.dump(training_info, f, indent=2)
             
+            # CPU 추론용 양자화 모델 (예측기가 GPU 없는 환경에서 사용)
+            self._export_tflite(model, Path("models") / f"{model_name}.tflite")
+            
             # 학습 완료
-            self.training_status["status"] = "completed"
-            self.training_status["metrics"]["accuracy"] = accuracy
+            self._update_status(status="completed", accuracy=float(accuracy))
             
             print(f"✅ 모델 학습 완료! 정확도: {accuracy:.3f}")
             print(f"📁 저장 위치: {model_path}")
@@ -241,305 +265,320 @@ class ModelTrainer:
             print(f"❌ 학습 중 오류 발생: {e}")
             import traceback
             traceback.print_exc()
-            self.training_status["status"] = "failed"
+            self._update_status(status="failed")
             self._update_progress_callback(f"학습 실패: {str(e)}")
         
         finally:
             self.is_training = False
+            self.epoch_event.set()
+    
+    def _export_tflite(self, model: tf.keras.Model, tflite_path: Path) -> bool:
+        """추론 전용 TFLite 모델 저장 (가중치 int8 동적 범위 양자화)
+        
+        변환에 실패해도 .h5 모델로 예측할 수 있으므로 학습 결과에는 영향 없음
+        """
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            tmp_path = tflite_path.with_name(f".{tflite_path.name}.tmp")
+            tmp_path.write_bytes(converter.convert())
+            os.replace(tmp_path, tflite_path)
+            print(f"📦 TFLite 모델 저장: {tflite_path}")
+            return True
+        except Exception as e:
+            print(f"⚠️ TFLite 변환 실패 (.h5 모델로 예측): {e}")
+            return False
+    
+    def _load_training_data(self, interval: str, days: int) -> Optional[pd.DataFrame]:
+        """과거 데이터 + 지표 로드 (심볼/간격/기간/날짜 기준 Parquet 캐시)
+        
+        같은 심볼/간격/기간의 캐시는 최신 날짜 파일 하나만 유지
+        """
+        prefix = f"{self.symbol}_{interval}_{days}d_"
+        cache_path = TRAINING_CACHE_DIR / f"{prefix}{datetime.now():%Y%m%d}.parquet"
+        
+        try:
+            df = pd.read_parquet(cache_path)
+            print(f"📦 캐시된 학습 데이터 사용: {cache_path} ({len(df):,}행)")
+            return df
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ 캐시 읽기 실패, 새로 수집합니다: {e}")
+        
+        # 심볼별 공유 DataCollector (반복 학습 시 초기화 생략)
+        from .data_collector import DataCollector
+        data_collector = DataCollector.shared(self.symbol)
+        
+        df = data_collector.collect_historical_data(interval=interval, days=days)
+        if df is None:
+            return None
+        
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체 (중단 시 손상된 캐시 방지)
+            tmp_path = cache_path.with_suffix(".parquet.tmp")
+            df.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, cache_path)
+            
+            # 지난 날짜의 같은 조건 캐시 정리 (하루마다 파일이 쌓이지 않도록)
+            for old_path in TRAINING_CACHE_DIR.glob(f"{prefix}*.parquet"):
+                if old_path != cache_path:
+                    old_path.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"⚠️ 학습 데이터 캐시 저장 실패: {e}")
+        
+        return df
+    
+    def _get_distribute_strategy(self) -> tf.distribute.Strategy:
+        """GPU 2개 이상이면 MirroredStrategy, 아니면 기본 전략"""
+        gpus = tf.config.list_logical_devices('GPU')
+        if len(gpus) > 1:
+            strategy = tf.distribute.MirroredStrategy()
+            print(f"🖥️ 멀티 GPU 학습: {strategy.num_replicas_in_sync}개 복제본")
+            return strategy
+        return tf.distribute.get_strategy()
     
     def _prepare_features(self, df: pd.DataFrame, selected_indicators: Dict[str, bool]) -> pd.DataFrame:
         """선택된 지표만 추출 (MACD 완전 제외)"""
-        feature_columns = []
         
-        # MACD 관련 컬럼 제외 리스트
-        macd_columns = ['macd', 'macd_signal', 'macd_histogram']
+        # MACD 관련 컬럼 제외 (집합 연산으로 한 번에 걸러냄)
+        macd_columns = {'macd', 'macd_signal', 'macd_histogram'}
+        available_columns = set(df.columns) - macd_columns
         
         print("📋 선택된 지표 (MACD 제외):")
         
-        # 필수 지표는 항상 포함
-        for indicator, columns in self.essential_indicators.items():
-            # MACD 컬럼 제외
-            existing_columns = [
-                col for col in columns 
-                if col in df.columns and col not in macd_columns
-            ]
-            feature_columns.extend(existing_columns)
-            print(f"   ✅ {indicator}: {len(existing_columns)}개 컬럼 (필수)")
-        
-        # 선택적 지표
-        for indicator, selected in selected_indicators.items():
-            if selected and indicator in self.optional_indicators:
-                columns = self.optional_indicators[indicator]
-                existing_columns = [
-                    col for col in columns 
-                    if col in df.columns and col not in macd_columns
-                ]
-                feature_columns.extend(existing_columns)
-                print(f"   ✅ {indicator}: {len(existing_columns)}개 컬럼 (선택)")
-        
-        if not feature_columns:
-            raise Exception("선택된 지표가 없습니다.")
+        # 필수 지표는 항상 포함 + 선택적 지표
+        indicator_groups = [
+            (indicator, columns, "필수") for indicator, columns in self.essential_indicators.items()
+        ] + [
+            (indicator, self.optional_indicators[indicator], "선택")
+            for indicator, selected in selected_indicators.items()
+            if selected and indicator in self.optional_indicators
+        ]
         
-        # 중복 제거
-        feature_columns = list(set(feature_columns))
+        wanted_columns = set()
+        for indicator, columns, kind in indicator_groups:
+            existing_columns = available_columns.intersection(columns)
+            wanted_columns |= existing_columns
+            print(f"   ✅ {indicator}: {len(existing_columns)}개 컬럼 ({kind})")
         
-        # MACD 컬럼이 실수로 포함되었는지 최종 체크
-        feature_columns = [col for col in feature_columns if col not in macd_columns]
+        if not wanted_columns:
+            raise Exception("선택된 지표가 없습니다.")
+        
+        # 중복 없이 DataFrame 컬럼 순서 유지 (이후 to_numpy 시 연속 메모리)
+        feature_columns = [col for col in df.columns if col in wanted_columns]
         
         print(f"📊 총 특성 개수: {len(feature_columns)}개")
         print(f"   (MACD 관련 지표 제외 확인 완료)")
         
-        return df[feature_columns].dropna()
-    
-def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
-    """🆕 진짜 추세 전환 라벨링 (지속성 확인)"""
-    
-    labels = pd.Series(0, index=df.index)  # 기본값: none
-    
-    # ============================================================================
-    # 1. 기본 지표들 추출
-    # ============================================================================
-    
-    rsi = df['rsi_14'] if 'rsi_14' in df.columns else pd.Series(50, index=df.index)
-    adx = df['adx'] if 'adx' in df.columns else pd.Series(25, index=df.index)  
-    bb_pos = df['bb_position'] if 'bb_position' in df.columns else pd.Series(0.5, index=df.index)
-    aroon_osc = df['aroon_oscillator'] if 'aroon_oscillator' in df.columns else pd.Series(0, index=df.index)
-    atr = df['atr'] if 'atr' in df.columns else df['close'].rolling(14).std()
-    volume_ratio = df['volume_ratio'] if 'volume_ratio' in df.columns else pd.Series(1, index=df.index)
-    consec_up = df['consecutive_up'] if 'consecutive_up' in df.columns else pd.Series(0, index=df.index)
-    consec_down = df['consecutive_down'] if 'consecutive_down' in df.columns else pd.Series(0, index=df.index)
-    
-    # ============================================================================
-    # 2. 추세 전환 지속성 확인 (핵심 개선!)
-    # ============================================================================
-    
-    current_close = df['close']
-    transaction_cost = 0.0011  # 0.11%
+        return df[feature_columns].dropna(axis=0, how='any')
     
-    # 🎯 추세 전환 성공 조건: "지속성" 확인
-    def check_trend_reversal_success(current_idx, direction):
-        """
-        추세 전환 성공 여부 확인
-        - direction: 1 (상승), -1 (하락)
-        - 최소 3개 봉(45분) 동안 지속되어야 함
-        """
-        if current_idx >= len(current_close) - 4:  # 데이터 부족
-            return False
-            
-        entry_price = current_close.iloc[current_idx]
+    def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
+        """🆕 진짜 추세 전환 라벨링 (지속성 확인)"""
+        
+        n = len(df)
+        
+        # ============================================================================
+        # 1. 기본 지표들 추출 (원시 배열로 한 번만 꺼냄)
+        # ============================================================================
+        
+        def column(name: str, default: float) -> np.ndarray:
+            if name in df.columns:
+                return df[name].to_numpy(dtype=np.float64)
+            return np.full(n, default, dtype=np.float64)
+        
+        close = df['close'].to_numpy(dtype=np.float64)
+        rsi = column('rsi_14', 50)
+        adx = column('adx', 25)
+        bb_pos = column('bb_position', 0.5)
+        aroon_osc = column('aroon_oscillator', 0)
+        atr = df['atr'].to_numpy(dtype=np.float64) if 'atr' in df.columns else df['close'].rolling(14).std().to_numpy()
+        volume_ratio = column('volume_ratio', 1)
+        consec_up = column('consecutive_up', 0)
+        consec_down = column('consecutive_down', 0)
+        
+        # ============================================================================
+        # 2. 추세 전환 지속성 확인 (핵심 개선!)
+        # ============================================================================
+        
+        transaction_cost = 0.0011  # 0.11%
         
         # 📊 지속성 확인 기준
         min_duration = 3  # 최소 3개 봉 (45분)
         min_profit_threshold = transaction_cost * 2  # 수수료의 2배 (0.22%)
         max_drawdown = transaction_cost  # 최대 낙폭 = 수수료만큼 (0.11%)
         
-        success_conditions = []
+        # 마지막 4개는 미래 데이터 부족으로 제외
+        valid = max(n - 4, 0)
+        entry = close[:valid]
         
-        for i in range(1, min_duration + 1):
-            if current_idx + i >= len(current_close):
-                return False
-                
-            future_price = current_close.iloc[current_idx + i]
-            future_return = (future_price - entry_price) / entry_price
-            
-            if direction == 1:  # 상승 전환 체크
-                # 조건 1: 최소 수익률 달성
-                profit_achieved = future_return > min_profit_threshold
-                
-                # 조건 2: 중간에 손절선 안 터짐 (entry_price 기준 -0.11% 이하로 안떨어짐)
-                max_loss_ok = True
-                for j in range(1, i + 1):
-                    temp_price = current_close.iloc[current_idx + j]
-                    temp_return = (temp_price - entry_price) / entry_price
-                    if temp_return < -max_drawdown:
-                        max_loss_ok = False
-                        break
-                
-                success_conditions.append(profit_achieved and max_loss_ok)
-                
-            else:  # 하락 전환 체크 (direction == -1)
-                # 조건 1: 최소 수익률 달성 (Short이므로 반대)
-                profit_achieved = future_return < -min_profit_threshold
-                
-                # 조건 2: 중간에 손절선 안 터짐 (entry_price 기준 +0.11% 이상으로 안올라감)
-                max_loss_ok = True
-                for j in range(1, i + 1):
-                    temp_price = current_close.iloc[current_idx + j]
-                    temp_return = (temp_price - entry_price) / entry_price
-                    if temp_return > max_drawdown:
-                        max_loss_ok = False
-                        break
-                
-                success_conditions.append(profit_achieved and max_loss_ok)
+        # future_returns[k-1] = k봉 후 수익률 (k = 1..3), 형태 (3, valid)
+        future_returns = np.stack([
+            (close[k:k + valid] - entry) / entry for k in range(1, min_duration + 1)
+        ]) if valid else np.empty((min_duration, 0))
+        
+        # 🎯 k봉 성공 = k봉 후 목표 수익 달성 & 1..k봉 동안 손절선 미돌파
+        long_success = (
+            (future_returns > min_profit_threshold) &
+            np.logical_and.accumulate(future_returns >= -max_drawdown, axis=0)
+        )
+        short_success = (
+            (future_returns < -min_profit_threshold) &
+            np.logical_and.accumulate(future_returns <= max_drawdown, axis=0)
+        )
         
         # 🏆 성공 조건: 3개 봉 중 최소 2개 이상 성공
-        return sum(success_conditions) >= 2
-    
-    # ============================================================================
-    # 3. AI 진입 조건 (기존과 동일하지만 조금 더 엄격하게)
-    # ============================================================================
-    
-    # Long 진입 신호 조건
-    long_entry_conditions = (
-        # 조건 1: RSI 과매도 탈출 (더 엄격)
-        ((rsi > 30) & (rsi < 50)) &
+        long_reversal = long_success.sum(axis=0) >= 2
+        short_reversal = short_success.sum(axis=0) >= 2
         
-        # 조건 2: 볼린저 밴드 위치 (더 엄격)
-        ((bb_pos > 0.2) & (bb_pos < 0.4)) &
+        # ============================================================================
+        # 3. AI 진입 조건 (기존과 동일하지만 조금 더 엄격하게)
+        # ============================================================================
         
-        # 조건 3: Aroon 상승 모멘텀
-        (aroon_osc > -20) &
+        # Long 진입 신호 조건
+        long_entry_conditions = (
+            # 조건 1: RSI 과매도 탈출 (더 엄격)
+            (rsi > 30) & (rsi < 50) &
+            
+            # 조건 2: 볼린저 밴드 위치 (더 엄격)
+            (bb_pos > 0.2) & (bb_pos < 0.4) &
+            
+            # 조건 3: Aroon 상승 모멘텀
+            (aroon_osc > -20) &
+            
+            # 조건 4: 연속 하락 후 안정화 (더 엄격)
+            (consec_down >= 2) & (consec_down <= 6)
+        )
         
-        # 조건 4: 연속 하락 후 안정화 (더 엄격)
-        ((consec_down >= 2) & (consec_down <= 6))
-    )
-    
-    # Short 진입 신호 조건  
-    short_entry_conditions = (
-        # 조건 1: RSI 과매수 하락 (더 엄격)
-        ((rsi > 50) & (rsi < 70)) &
+        # Short 진입 신호 조건  
+        short_entry_conditions = (
+            # 조건 1: RSI 과매수 하락 (더 엄격)
+            (rsi > 50) & (rsi < 70) &
+            
+            # 조건 2: 볼린저 밴드 위치 (더 엄격)
+            (bb_pos > 0.6) & (bb_pos < 0.8) &
+            
+            # 조건 3: Aroon 하락 모멘텀
+            (aroon_osc < 20) &
+            
+            # 조건 4: 연속 상승 후 안정화 (더 엄격)
+            (consec_up >= 2) & (consec_up <= 6)
+        )
         
-        # 조건 2: 볼린저 밴드 위치 (더 엄격)
-        ((bb_pos > 0.6) & (bb_pos < 0.8)) &
+        # ============================================================================
+        # 4. 시장 환경 필터링 (기존과 동일)
+        # ============================================================================
         
-        # 조건 3: Aroon 하락 모멘텀
-        (aroon_osc < 20) &
+        extreme_trend = (
+            (adx > 45) |
+            (consec_up > 8) |
+            (consec_down > 8) |
+            (volume_ratio < 0.4)
+        )
         
-        # 조건 4: 연속 상승 후 안정화 (더 엄격)
-        ((consec_up >= 2) & (consec_up <= 6))
-    )
-    
-    # ============================================================================
-    # 4. 시장 환경 필터링 (기존과 동일)
-    # ============================================================================
-    
-    extreme_trend = (
-        (adx > 45) |
-        (consec_up > 8) |
-        (consec_down > 8) |
-        (volume_ratio < 0.4)
-    )
-    
-    low_volatility = atr < (df['close'] * 0.003)  # 0.3%로 조금 올림
-    
-    # ============================================================================
-    # 5. 라벨 할당 (지속성 확인)
-    # ============================================================================
-    
-    print("🔍 추세 전환 지속성 확인 중...")
-    
-    for i in range(len(df) - 4):  # 마지막 4개는 미래 데이터 부족으로 제외
+        low_volatility = atr < (close * 0.003)  # 0.3%로 조금 올림
         
-        # Long 신호 체크
-        if (long_entry_conditions.iloc[i] and 
-            not extreme_trend.iloc[i] and 
-            not low_volatility.iloc[i]):
-            
-            if check_trend_reversal_success(i, direction=1):
-                labels.iloc[i] = 1  # Long 성공
+        # ============================================================================
+        # 5. 라벨 할당 (지속성 확인)
+        # ============================================================================
+        
+        print("🔍 추세 전환 지속성 확인 중...")
+        
+        tradable = ~extreme_trend[:valid] & ~low_volatility[:valid]
+        
+        label_values = np.zeros(n, dtype=np.int8)  # 기본값: none (클래스 3개 → int8)
+        label_values[:valid][long_entry_conditions[:valid] & tradable & long_reversal] = 1  # Long 성공
+        label_values[:valid][short_entry_conditions[:valid] & tradable & short_reversal] = 2  # Short 성공
+        labels = pd.Series(label_values, index=df.index)
+        
+        # ============================================================================
+        # 6. 통계 및 검증
+        # ============================================================================
+        
+        valid_count = n - 4
+        none_count = int((label_values == 0).sum())
+        long_count = int((label_values == 1).sum())
+        short_count = int((label_values == 2).sum())
+        
+        print(f"🎯 지속성 기반 라벨 분포:")
+        print(f"   - None (클래스 0): {none_count:,}개 ({none_count/valid_count*100:.1f}%)")
+        print(f"   - Long (클래스 1): {long_count:,}개 ({long_count/valid_count*100:.1f}%)")
+        print(f"   - Short (클래스 2): {short_count:,}개 ({short_count/valid_count*100:.1f}%)")
         
-        # Short 신호 체크
-        if (short_entry_conditions.iloc[i] and 
-            not extreme_trend.iloc[i] and 
-            not low_volatility.iloc[i]):
+        # ============================================================================
+        # 7. 라벨 품질 검증 (실제 성과 확인)
+        # ============================================================================
+        
+        # 3봉 후 수익률 (마지막 3개 봉은 계산 불가)
+        returns_3candle = np.full(n, np.nan)
+        if n > 3:
+            returns_3candle[:-3] = (close[3:] - close[:-3]) / close[:-3]
+        has_exit = ~np.isnan(returns_3candle)
+        
+        if long_count > 0:
+            # Long 라벨의 3봉 후 평균 수익률
+            long_3candle_returns = returns_3candle[(label_values == 1) & has_exit]
             
-            if check_trend_reversal_success(i, direction=-1):
-                labels.iloc[i] = 2  # Short 성공
-    
-    # ============================================================================
-    # 6. 통계 및 검증
-    # ============================================================================
-    
-    valid_count = len(labels) - 4
-    none_count = (labels == 0).sum()
-    long_count = (labels == 1).sum()
-    short_count = (labels == 2).sum()
-    
-    print(f"🎯 지속성 기반 라벨 분포:")
-    print(f"   - None (클래스 0): {none_count:,}개 ({none_count/valid_count*100:.1f}%)")
-    print(f"   - Long (클래스 1): {long_count:,}개 ({long_count/valid_count*100:.1f}%)")
-    print(f"   - Short (클래스 2): {short_count:,}개 ({short_count/valid_count*100:.1f}%)")
-    
-    # ============================================================================
-    # 7. 라벨 품질 검증 (실제 성과 확인)
-    # ============================================================================
-    
-    if long_count > 0:
-        # Long 라벨의 3봉 후 평균 수익률
-        long_3candle_returns = []
-        for i in range(len(labels)):
-            if labels.iloc[i] == 1 and i + 3 < len(df):
-                entry_price = current_close.iloc[i]
-                exit_price = current_close.iloc[i + 3]
-                return_rate = (exit_price - entry_price) / entry_price
-                long_3candle_returns.append(return_rate)
-        
-        if long_3candle_returns:
-            avg_return = sum(long_3candle_returns) / len(long_3candle_returns)
-            success_rate = sum(1 for r in long_3candle_returns if r > transaction_cost) / len(long_3candle_returns)
-            
-            print(f"📈 Long 라벨 검증 (3봉 후):")
-            print(f"   - 성공률: {success_rate*100:.1f}%")
-            print(f"   - 평균 수익률: {avg_return*100:.2f}%")
-            print(f"   - 예상 순수익: {(avg_return - transaction_cost)*100:.2f}%")
-    
-    if short_count > 0:
-        # Short 라벨의 3봉 후 평균 수익률
-        short_3candle_returns = []
-        for i in range(len(labels)):
-            if labels.iloc[i] == 2 and i + 3 < len(df):
-                entry_price = current_close.iloc[i]
-                exit_price = current_close.iloc[i + 3]
-                return_rate = (entry_price - exit_price) / entry_price  # Short는 반대
-                short_3candle_returns.append(return_rate)
-        
-        if short_3candle_returns:
-            avg_return = sum(short_3candle_returns) / len(short_3candle_returns)
-            success_rate = sum(1 for r in short_3candle_returns if r > transaction_cost) / len(short_3candle_returns)
-            
-            print(f"📉 Short 라벨 검증 (3봉 후):")
-            print(f"   - 성공률: {success_rate*100:.1f}%")
-            print(f"   - 평균 수익률: {avg_return*100:.2f}%")
-            print(f"   - 예상 순수익: {(avg_return - transaction_cost)*100:.2f}%")
-    
-    # 신호 품질 평가
-    total_signals = long_count + short_count
-    signal_ratio = total_signals / valid_count
-    
-    if signal_ratio < 0.002:  # 0.2% 미만
-        print("⚠️ 진짜 추세 전환이 너무 적습니다 - 조건을 완화하세요")
-    elif signal_ratio > 0.01:  # 1% 초과  
-        print("⚠️ 신호가 여전히 많습니다 - 조건을 더 강화하세요")
-    else:
-        print("✅ 적절한 진짜 추세 전환 비율입니다")
-    
-    print(f"\n🔥 진짜 추세 전환 포착률: {signal_ratio*100:.3f}%")
-    print(f"   (전체 {valid_count:,}개 중 {total_signals:,}개)")
-    
-    return labels
+            if long_3candle_returns.size:
+                avg_return = long_3candle_returns.mean()
+                success_rate = (long_3candle_returns > transaction_cost).mean()
+                
+                print(f"📈 Long 라벨 검증 (3봉 후):")
+                print(f"   - 성공률: {success_rate*100:.1f}%")
+                print(f"   - 평균 수익률: {avg_return*100:.2f}%")
+                print(f"   - 예상 순수익: {(avg_return - transaction_cost)*100:.2f}%")
+        
+        if short_count > 0:
+            # Short 라벨의 3봉 후 평균 수익률 (Short는 반대)
+            short_3candle_returns = -returns_3candle[(label_values == 2) & has_exit]
+            
+            if short_3candle_returns.size:
+                avg_return = short_3candle_returns.mean()
+                success_rate = (short_3candle_returns > transaction_cost).mean()
+                
+                print(f"📉 Short 라벨 검증 (3봉 후):")
+                print(f"   - 성공률: {success_rate*100:.1f}%")
+                print(f"   - 평균 수익률: {avg_return*100:.2f}%")
+                print(f"   - 예상 순수익: {(avg_return - transaction_cost)*100:.2f}%")
+        
+        # 신호 품질 평가
+        total_signals = long_count + short_count
+        signal_ratio = total_signals / valid_count
+        
+        if signal_ratio < 0.002:  # 0.2% 미만
+            print("⚠️ 진짜 추세 전환이 너무 적습니다 - 조건을 완화하세요")
+        elif signal_ratio > 0.01:  # 1% 초과  
+            print("⚠️ 신호가 여전히 많습니다 - 조건을 더 강화하세요")
+        else:
+            print("✅ 적절한 진짜 추세 전환 비율입니다")
+        
+        print(f"\n🔥 진짜 추세 전환 포착률: {signal_ratio*100:.3f}%")
+        print(f"   (전체 {valid_count:,}개 중 {total_signals:,}개)")
+        
+        return labels
     
     def _prepare_training_data(self, feature_data: pd.DataFrame, labels: pd.Series, 
-                              training_params: Dict) -> Tuple[np.ndarray, np.ndarray, MinMaxScaler]:
+                              training_params: Dict) -> Tuple[np.ndarray, np.ndarray, FastMinMaxScaler]:
         """학습 데이터 준비 (시퀀스 데이터로 변환)"""
         
         sequence_length = training_params.get("sequence_length", 60)
         
-        # 데이터 정규화
-        scaler = MinMaxScaler()
-        scaled_features = scaler.fit_transform(feature_data)
-        
-        # 시퀀스 데이터 생성
-        X, y = [], []
+        if not self.is_training:
+            raise Exception("학습이 중지되었습니다.")
         
-        for i in range(sequence_length, len(scaled_features)):
-            if not self.is_training:
-                break
-                
-            X.append(scaled_features[i-sequence_length:i])
-            y.append(labels.iloc[i])
+        # 데이터 정규화 (float32 사본 1개에서 제자리 연산, LSTM 입력 대역폭 절반)
+        scaler = FastMinMaxScaler()
+        scaled_features = scaler.fit_transform(feature_data)
         
-        X = np.array(X)
-        y = np.array(y)
+        # 시퀀스 데이터 생성 (복사 없는 슬라이딩 윈도우 뷰)
+        # windows[k] = scaled_features[k:k+seq] (F, seq) → 마지막 윈도우는 다음 봉 라벨이 없으므로 제외
+        windows = np.lib.stride_tricks.sliding_window_view(
+            scaled_features, window_shape=sequence_length, axis=0
+        )
+        X = windows[:-1].transpose(0, 2, 1)  # (샘플, 시퀀스, 특성)
+        X = X.astype(np.float32, copy=False)  # 이미 float32면 복사 없음 (뷰 유지)
+        y = labels.iloc[sequence_length:len(scaled_features)].to_numpy(dtype=np.int8)
         
         print(f"📊 학습 데이터 형태: X={X.shape}, y={y.shape}")
         print(f"   - 시퀀스 길이: {sequence_length}")
@@ -551,38 +590,55 @@ def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
     def _build_model_3class(self, input_shape: Tuple, training_params: Dict) -> tf.keras.Model:
         """🆕 3-클래스 분류를 위한 LSTM 모델"""
         
+        # 🆕 GPU에서는 혼합 정밀도 (연산 float16, 가중치/출력 float32)
+        # 전역 정책 대신 레이어별 dtype 지정 → 같은 프로세스의 예측 모델에 영향 없음
+        use_mixed = bool(tf.config.list_physical_devices('GPU'))
+        policy = 'mixed_float16' if use_mixed else 'float32'
+        
+        # 🆕 cuDNN 고속 커널 조건 (tanh/sigmoid, recurrent_dropout=0, unroll=False, use_bias=True)을
+        # 명시하고, BatchNormalization은 LSTM 스택 뒤에 한 번만 적용
+        cudnn_args = dict(activation='tanh', recurrent_activation='sigmoid',
+                          recurrent_dropout=0.0, unroll=False, use_bias=True)
+        
         model = Sequential([
             # 첫 번째 LSTM 레이어 (증가)
-            LSTM(128, return_sequences=True, input_shape=input_shape[1:]),
-            Dropout(0.3),
-            BatchNormalization(),
+            LSTM(128, return_sequences=True, input_shape=input_shape[1:], dtype=policy, **cudnn_args),
+            Dropout(0.3, dtype=policy),
             
             # 두 번째 LSTM 레이어
-            LSTM(64, return_sequences=False),
-            Dropout(0.3),
-            BatchNormalization(),
+            LSTM(64, return_sequences=False, dtype=policy, **cudnn_args),
+            Dropout(0.3, dtype=policy),
+            BatchNormalization(dtype=policy),
             
             # Dense 레이어들
-            Dense(64, activation='relu'),
-            Dropout(0.4),
-            Dense(32, activation='relu'),
-            Dropout(0.3),
-            Dense(16, activation='relu'),
-            Dropout(0.2),
-            
-            # 🆕 출력 레이어 (3-클래스)
-            Dense(3, activation='softmax')  # 3개 클래스: none, long, short
+            Dense(64, activation='relu', dtype=policy),
+            Dropout(0.4, dtype=policy),
+            Dense(32, activation='relu', dtype=policy),
+            Dropout(0.3, dtype=policy),
+            Dense(16, activation='relu', dtype=policy),
+            Dropout(0.2, dtype=policy),
+            
+            # 🆕 출력 레이어 (3-클래스, softmax/loss는 수치 안정성을 위해 float32 유지)
+            Dense(3, activation='softmax', dtype='float32')  # 3개 클래스: none, long, short
         ])
         
         # 컴파일
         learning_rate = training_params.get("learning_rate", 0.001)
         optimizer = Adam(learning_rate=learning_rate)
+        if use_mixed:
+            # float16 기울기 언더플로 방지용 동적 손실 스케일링
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+        
+        # 🆕 XLA JIT 컴파일 (고정 입력 형태 → 커널 융합)
+        # GPU에서는 XLA가 cuDNN LSTM 커널을 쓰지 못하므로 기본 비활성 (파라미터로 강제 가능)
+        jit_compile = training_params.get("jit_compile", not use_mixed)
         
         model.compile(
             optimizer=optimizer,
             loss='sparse_categorical_crossentropy',  # 3-클래스용 loss
             metrics=['accuracy', 
-                    tf.keras.metrics.SparseCategoricalAccuracy(name='categorical_accuracy')]
+                    tf.keras.metrics.SparseCategoricalAccuracy(name='categorical_accuracy')],
+            jit_compile=jit_compile
         )
         
         print("🧠 3-클래스 모델 구조:")
@@ -591,14 +647,14 @@ def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
         return model
     
     def _train_with_progress(self, model: tf.keras.Model, X: np.ndarray, y: np.ndarray, 
-                           training_params: Dict) -> tf.keras.callbacks.History:
-        """진행률 모니터링과 함께 학습 실행"""
+                           training_params: Dict) -> Tuple[tf.keras.callbacks.History, np.ndarray, np.ndarray]:
+        """진행률 모니터링과 함께 학습 실행 (history, 검증 X, 검증 y 반환)"""
         
-        # 학습/검증 데이터 분할
+        # 학습/검증 데이터 분할 (인덱스만 계층 분할 → X는 슬라이딩 윈도우 뷰 그대로 유지)
         validation_split = training_params.get("validation_split", 20) / 100
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y, test_size=validation_split, random_state=42, stratify=y
-        )
+        splitter = StratifiedShuffleSplit(n_splits=1, test_size=validation_split, random_state=42)
+        train_idx, val_idx = next(splitter.split(np.zeros(len(y)), y))
+        y_train, y_val = y[train_idx], y[val_idx]
         
         # 🆕 클래스 가중치 계산 (불균형 해결)
         unique_classes = np.unique(y_train)
@@ -614,13 +670,18 @@ def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
         print(f"   - Long (1): {class_weight_dict.get(1, 1.0):.2f}")
         print(f"   - Short (2): {class_weight_dict.get(2, 1.0):.2f}")
         
-        # 배치 크기
-        batch_size = training_params.get("batch_size", 32)
+        # 배치 크기 (복제본마다 batch_size → 전역 배치는 복제본 수만큼 증가)
+        replicas = self.strategy.num_replicas_in_sync if self.strategy else 1
+        batch_size = training_params.get("batch_size", 32) * replicas
         epochs = training_params.get("epochs", 100)
         
         # 총 배치 수 계산
-        total_batches = len(X_train) // batch_size
-        self.training_status["total_batches"] = total_batches
+        total_batches = len(train_idx) // batch_size
+        self._update_status(total_batches=total_batches)
+        
+        # 🆕 tf.data 입력 파이프라인 (배치 단위로만 윈도우를 복사, 학습과 겹쳐 실행)
+        train_ds = self._make_window_dataset(X, y, train_idx, batch_size, shuffle=True)
+        val_ds = self._make_window_dataset(X, y, val_idx, batch_size, shuffle=False)
         
         # 콜백 함수들
         callbacks = [
@@ -641,36 +702,65 @@ def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
         
         # 학습 실행 (클래스 가중치 적용)
         history = model.fit(
-            X_train, y_train,
-            batch_size=batch_size,
+            train_ds,
             epochs=epochs,
-            validation_data=(X_val, y_val),
+            validation_data=val_ds,
             class_weight=class_weight_dict,  # 클래스 가중치 적용
             callbacks=callbacks,
             verbose=0
         )
         
-        return history
+        # 평가용 검증 데이터만 실체화 (전체의 validation_split 비율)
+        return history, X[val_idx], y_val
+    
+    @staticmethod
+    def _make_window_dataset(X: np.ndarray, y: np.ndarray, indices: np.ndarray,
+                             batch_size: int, shuffle: bool) -> tf.data.Dataset:
+        """샘플 인덱스 → (X 배치, y 배치) 데이터셋 (전체 X 복사 없이 배치마다 gather)"""
+        ds = tf.data.Dataset.from_tensor_slices(indices)
+        if shuffle:
+            # 인덱스만 섞으므로 전체 길이 버퍼도 가벼움
+            ds = ds.shuffle(len(indices), reshuffle_each_iteration=True)
+        
+        def gather(batch_idx):
+            return gather_windows(X, batch_idx), y[batch_idx]
+        
+        def load(batch_idx):
+            X_batch, y_batch = tf.numpy_function(gather, [batch_idx], (tf.float32, tf.int8))
+            X_batch.set_shape((None,) + X.shape[1:])
+            y_batch.set_shape((None,))
+            return X_batch, y_batch
+        
+        return (
+            ds.batch(batch_size)
+            .map(load, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE)
+        )
     
     def _evaluate_model_3class(self, model: tf.keras.Model, X: np.ndarray, y: np.ndarray) -> float:
-        """🆕 3-클래스 모델 평가"""
+        """🆕 3-클래스 모델 평가 (검증 데이터 기준)"""
         
-        # 예측 수행
-        y_pred_proba = model.predict(X, verbose=0)
+        # 예측 수행 (배치 단위 스트리밍으로 전체 확률 행렬과 입력 동시 적재 방지)
+        predict_ds = (
+            tf.data.Dataset.from_tensor_slices(X)
+            .batch(1024)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        y_pred_proba = model.predict(predict_ds, verbose=0)
         y_pred = np.argmax(y_pred_proba, axis=1)
         
         # 정확도 계산
-        accuracy = accuracy_score(y, y_pred)
+        accuracy = float(np.mean(y_pred == y))
         
-        # 혼동 행렬
-        cm = confusion_matrix(y, y_pred)
+        # 혼동 행렬 (검증 데이터에 없는 클래스가 있어도 3x3 유지)
+        cm = confusion_matrix(y, y_pred, labels=[0, 1, 2])
         
         # 상세 리포트
         print("\n📊 3-클래스 모델 평가 결과:")
         print(f"   전체 정확도: {accuracy:.3f}")
         
         print("\n📈 클래스별 성능:")
-        report = classification_report(y, y_pred, 
+        report = classification_report(y, y_pred, labels=[0, 1, 2],
                                       target_names=['None (0)', 'Long (1)', 'Short (2)'],
                                       output_dict=True)
         
@@ -703,9 +793,9 @@ def _create_labels_3class(self, df: pd.DataFrame) -> pd.Series:
     
     def _update_progress_callback(self, message: str):
         """진행률 콜백 업데이트"""
-        if self.training_status.get("progress_callback"):
+        if self.progress_callback:
             try:
-                self.training_status["progress_callback"](message)
+                self.progress_callback(message)
             except:
                 pass
 
@@ -715,39 +805,50 @@ class TrainingProgressCallback(tf.keras.callbacks.Callback):
     def __init__(self, trainer: ModelTrainer):
         super().__init__()
         self.trainer = trainer
+        # 배치 단위 갱신 주기 (매 배치마다 Python 콜백 비용이 들지 않도록 N배치마다 한 번)
+        self._every = max(1, int(os.environ.get("NHBOT_PROGRESS_EVERY", "32")))
     
     def on_epoch_begin(self, epoch, logs=None):
         if not self.trainer.is_training:
             self.model.stop_training = True
             return
             
-        self.trainer.training_status["current_epoch"] = epoch + 1
-        self.trainer._update_progress_callback(f"에폭 {epoch + 1}/{self.trainer.training_status['total_epochs']}")
+        self.trainer._update_status(current_epoch=epoch + 1)
+        self.trainer.epoch_event.set()
+        self.trainer._update_progress_callback(f"에폭 {epoch + 1}/{self.trainer.get_training_status().total_epochs}")
     
     def on_batch_end(self, batch, logs=None):
+        if batch % self._every:
+            return
+        
+        # 중지 요청 확인도 N배치마다 (에폭 시작 시에도 확인)
         if not self.trainer.is_training:
             self.model.stop_training = True
             return
             
-        self.trainer.training_status["current_batch"] = batch + 1
-        
-        # 메트릭 업데이트
+        # 배치 번호 + 메트릭 업데이트
         if logs:
-            metrics = self.trainer.training_status["metrics"]
-            metrics["loss"] = logs.get("loss", 0)
-            metrics["accuracy"] = logs.get("accuracy", 0)
-            metrics["val_loss"] = logs.get("val_loss", 0)
-            metrics["val_accuracy"] = logs.get("val_accuracy", 0)
+            self.trainer._update_status(current_batch=batch + 1, **self._metrics(logs))
+        else:
+            self.trainer._update_status(current_batch=batch + 1)
     
     def on_epoch_end(self, epoch, logs=None):
         if logs:
-            metrics = self.trainer.training_status["metrics"] 
-            metrics["loss"] = logs.get("loss", 0)
-            metrics["accuracy"] = logs.get("accuracy", 0)
-            metrics["val_loss"] = logs.get("val_loss", 0)
-            metrics["val_accuracy"] = logs.get("val_accuracy", 0)
+            metrics = self._metrics(logs)
+            self.trainer._update_status(**metrics)
+            self.trainer.epoch_event.set()
             
             print(f"에폭 {epoch + 1}: 손실={metrics['loss']:.4f}, 정확도={metrics['accuracy']:.3f}")
+    
+    @staticmethod
+    def _metrics(logs: Dict) -> Dict[str, float]:
+        """Keras logs → 스냅샷 메트릭 필드"""
+        return {
+            "loss": float(logs.get("loss", 0)),
+            "accuracy": float(logs.get("accuracy", 0)),
+            "val_loss": float(logs.get("val_loss", 0)),
+            "val_accuracy": float(logs.get("val_accuracy", 0))
+        }
 
 # ============================================================================
 # 사용 예시 및 테스트
@@ -801,8 +902,8 @@ if __name__ == "__main__":
         for _ in range(3):
             time.sleep(5)
             status = trainer.get_training_status()
-            if status['status'] == 'running':
-                print(f"   진행중: {status['current_epoch']}/{status['total_epochs']} 에폭")
+            if status.status == 'running':
+                print(f"   진행중: {status.current_epoch}/{status.total_epochs} 에폭")
     else:
         print("❌ 학습 시작 실패")
     
@@ -1,30 +1,113 @@
 # 파일 경로: mainpc/nhbot_ai/predictor.py
 # 코드명: AI 예측기 클래스 (메인 PC 독립 실행 버전)
 
+import os
 import tensorflow as tf
 import numpy as np
 import pandas as pd
 import pickle
 import json
-from typing import Dict, List, Optional, Tuple
+import queue
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+from .scaler import FastMinMaxScaler
+
+PREDICT_TIMEOUT = 5.0  # 배치 추론 결과 대기 최대 시간 (초)
+
+_STOP = object()  # InferenceBatcher 종료 신호 (큐에 넣으면 앞선 요청까지 처리 후 스레드 종료)
+
+class InferenceBatcher:
+    """동시에 들어온 예측 요청을 모아 한 번의 배치 추론으로 실행 (마이크로 배칭)
+    
+    소비 스레드 하나가 큐에서 첫 요청을 꺼낸 뒤 그 사이 쌓인 요청을 max_batch개까지
+    더 꺼내 한 번에 추론. 요청이 하나뿐이면 기다리지 않고 바로 실행하므로
+    부하가 낮을 때 지연은 그대로이고, 동시 요청이 많을수록 호출 횟수가 줄어듦
+    """
+    
+    def __init__(self, infer: Callable[[np.ndarray], np.ndarray], max_batch: int = 32):
+        self._infer = infer
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, sample: np.ndarray) -> Future:
+        """샘플 하나 (시퀀스, 특성) 추론 요청, 결과는 Future로 반환"""
+        future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError("InferenceBatcher가 종료되었습니다"))
+            return future
+        self._queue.put((sample, future))
+        return future
+    
+    def close(self, timeout: Optional[float] = PREDICT_TIMEOUT):
+        """소비 스레드 종료 (이미 들어온 요청은 처리한 뒤 멈춤)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True  # 이번 배치까지만 처리
+                    break
+                batch.append(item)
+            
+            samples, futures = zip(*batch)
+            try:
+                outputs = self._infer(np.stack(samples))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            
+            for future, output in zip(futures, outputs):
+                future.set_result(output)
+
 class AIPredictor:
     """AI 기반 매매 신호 예측 클래스 (메인 PC 버전)"""
     
     def __init__(self, symbol: str = "BTCUSDT"):
         self.symbol = symbol
         self.model = None
+        self._predict_fn = None
+        self._interpreter = None  # CPU 전용 환경에서 쓰는 양자화 TFLite 인터프리터 (없으면 tf.function)
         self.scaler = None
         self.model_name = None
         self.model_accuracy = 0.0
         self.feature_columns = []
         self.sequence_length = 60
         
+        # 예측 입력 버퍼 (모델 로드 후 첫 예측 시 할당, 이후 재사용)
+        self._feature_buf = None
+        self._predict_lock = threading.Lock()  # Flask 동시 요청이 버퍼를 공유하지 않도록
+        self._batcher = InferenceBatcher(self._infer_batch)  # 동시 요청은 한 번의 배치 추론으로
+        
         # 예측 임계값 (신뢰도)
         self.prediction_threshold = 0.6  # 60% 이상 확신도일 때만 신호
         
+        # 최근 예측 기록 (deque가 최대 개수를 O(1)로 유지)
+        self.prediction_history = deque(maxlen=100)
+        
         # 메인 PC 경로 설정
         self.models_dir = Path("/app/models")
         self.models_dir.mkdir(exist_ok=True)
@@ -37,16 +120,15 @@ class AIPredictor:
     def load_model(self) -> bool:
         """AI 모델 로드 (로컬 파일 시스템에서)"""
         try:
-            # 메타데이터 파일 확인
+            # 메타데이터 로드 (없으면 중단)
             metadata_file = self.models_dir / "models_metadata.json"
-            if not metadata_file.exists():
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+            except FileNotFoundError:
                 print("⚠️ 모델 메타데이터가 없습니다.")
                 return False
             
-            # 메타데이터 로드
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
-            
             # 활성 모델 찾기
             active_model = metadata.get('active_model')
             if not active_model:
@@ -68,30 +150,41 @@ class AIPredictor:
             model_path = self.models_dir / f"{active_model}.h5"
             scaler_path = self.models_dir / f"{active_model}_scaler.pkl"
             info_path = self.models_dir / f"{active_model}_info.json"
+            tflite_path = self.models_dir / f"{active_model}.tflite"
             
-            if not model_path.exists():
+            try:
+                os.stat(model_path)
+            except FileNotFoundError:
                 print(f"⚠️ 모델 파일이 없습니다: {model_path}")
                 return False
             
             # 모델 로드
             self.model = tf.keras.models.load_model(model_path)
+            self._predict_fn = self._build_predict_fn(self.model)
+            self._interpreter = self._load_interpreter(tflite_path)
+            self._feature_buf = None
             self.model_name = active_model
             self.model_accuracy = model_info.get('accuracy', 0)
             
             # 스케일러 로드
-            if scaler_path.exists():
-                with open(scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-            else:
+            try:
+                self.scaler = pickle.loads(scaler_path.read_bytes())
+            except FileNotFoundError:
                 print("⚠️ 스케일러 파일이 없습니다. 정규화 없이 예측합니다.")
             
             # 모델 정보 로드 (feature columns, sequence_length 등)
-            if info_path.exists():
+            try:
                 with open(info_path, 'r') as f:
                     info = json.load(f)
-                    self.feature_columns = info.get('feature_columns', [])
-                    params = info.get('parameters', {})
-                    self.sequence_length = params.get('sequence_length', 60)
+                self.feature_columns = info.get('feature_columns', [])
+                params = info.get('parameters', {})
+                self.sequence_length = params.get('sequence_length', 60)
+            except FileNotFoundError:
+                pass
+            
+            # 첫 요청이 그래프 트레이싱/XLA 컴파일 비용을 떠안지 않도록 미리 한 번 실행
+            # (실패하거나 오래 걸려도 로드 결과에는 영향 없음)
+            self._warmup()
             
             print(f"✅ 모델 로드 완료: {active_model}")
             print(f"   정확도: {self.model_accuracy:.1%}")
@@ -103,9 +196,71 @@ class AIPredictor:
         except Exception as e:
             print(f"❌ 모델 로드 실패: {e}")
             self.model = None
+            self._predict_fn = None
+            self._interpreter = None
             self.scaler = None
             return False
     
+    @staticmethod
+    def _build_predict_fn(model: tf.keras.Model):
+        """그래프 컴파일된 추론 함수 생성 (model.predict의 호출당 오버헤드 제거)
+        
+        입력 형태를 (배치, 시퀀스, 특성)으로 고정해 한 번만 트레이싱 (배치 크기만 가변)
+        GPU에서는 cuDNN LSTM 커널 사용을 위해 XLA 없이 그래프만 컴파일
+        """
+        jit_compile = not tf.config.list_physical_devices('GPU')
+        input_spec = tf.TensorSpec(shape=(None,) + tuple(model.input_shape[1:]), dtype=tf.float32)
+        return tf.function(lambda x: model(x, training=False),
+                           input_signature=[input_spec], jit_compile=jit_compile)
+    
+    @staticmethod
+    def _load_interpreter(tflite_path: Path) -> Optional["tf.lite.Interpreter"]:
+        """GPU가 없고 양자화 TFLite 모델이 있으면 인터프리터 생성 (int8 가중치로 CPU 추론)"""
+        if tf.config.list_physical_devices('GPU'):
+            return None
+        try:
+            interpreter = tf.lite.Interpreter(model_path=str(tflite_path), num_threads=os.cpu_count())
+        except (FileNotFoundError, ValueError):
+            return None
+        interpreter.allocate_tensors()
+        print(f"📦 TFLite 양자화 모델 사용: {tflite_path.name}")
+        return interpreter
+    
+    def _warmup(self):
+        """더미 입력으로 추론 1회 실행 (트레이싱/컴파일을 로드 시점에 끝내기)
+        
+        배치 스레드를 거쳐 실행해 TFLite 인터프리터를 한 스레드에서만 사용
+        최선 노력: 예외는 로그만 남기고, 제한 시간 안에 끝나지 않으면 기다리지 않고 넘어감
+        (큐 순서상 이후 예측 요청은 워밍업이 끝난 뒤 처리됨)
+        """
+        try:
+            _, sequence_length, n_features = self.model.input_shape
+            dummy = np.zeros((sequence_length or self.sequence_length, n_features), dtype=np.float32)
+            self._batcher.submit(dummy).result(timeout=PREDICT_TIMEOUT * 12)
+        except FutureTimeoutError:
+            print("⚠️ 모델 워밍업이 지연되고 있습니다. 백그라운드에서 계속 진행합니다.")
+        except Exception as e:
+            print(f"⚠️ 모델 워밍업 실패 (첫 예측 시 컴파일): {e}")
+    
+    def _infer_batch(self, batch: np.ndarray) -> np.ndarray:
+        """배치 (N, 시퀀스, 특성) 추론 (InferenceBatcher 소비 스레드에서 호출)"""
+        interpreter = self._interpreter
+        if interpreter is None:
+            return self._predict_fn(tf.convert_to_tensor(batch, dtype=tf.float32)).numpy()
+        
+        # 배치 크기가 바뀔 때만 입력 텐서 크기 재할당
+        input_detail = interpreter.get_input_details()[0]
+        if tuple(input_detail['shape']) != batch.shape:
+            interpreter.resize_tensor_input(input_detail['index'], batch.shape)
+            interpreter.allocate_tensors()
+        interpreter.set_tensor(input_detail['index'], batch.astype(np.float32, copy=False))
+        interpreter.invoke()
+        return interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+    
+    def close(self):
+        """배치 추론 스레드 정리 (예측기를 교체할 때 호출)"""
+        self._batcher.close()
+    
     def reload_model(self) -> bool:
         """모델 재로드 (새 모델 활성화 시)"""
         print("🔄 AI 모델 재로드 중...")
@@ -123,16 +278,18 @@ class AIPredictor:
                 print(f"⚠️ 데이터 부족: {len(market_data) if market_data is not None else 0}개 (최소 {self.sequence_length}개 필요)")
                 return self._get_neutral_prediction()
             
-            # 특성 추출 및 전처리
-            features = self._prepare_features(market_data)
-            if features is None:
-                return self._get_neutral_prediction()
+            with self._predict_lock:
+                # 특성 추출 및 전처리 (버퍼는 다음 요청이 재사용하므로 샘플만 복사해 넘김)
+                features = self._prepare_features(market_data)
+                if features is None:
+                    return self._get_neutral_prediction()
+                sample = features[0].copy()
             
-            # 예측 수행
-            prediction = self.model.predict(features, verbose=0)
+            # 예측 수행 (동시 요청과 묶여 배치 추론)
+            prediction = self._batcher.submit(sample).result(timeout=PREDICT_TIMEOUT)
             
             # 예측 결과 해석
-            prediction_value = float(prediction[0][0])
+            prediction_value = float(prediction[0])
             
             # 신호 결정 (임계값 기반)
             if prediction_value > self.prediction_threshold:
@@ -160,6 +317,8 @@ class AIPredictor:
             # 예측 이유 추가 (디버깅용)
             result["reason"] = self._get_prediction_reason(market_data, prediction_value)
             
+            self.prediction_history.append(result)
+            
             return result
             
         except Exception as e:
@@ -167,46 +326,49 @@ class AIPredictor:
             return self._get_neutral_prediction()
     
     def _prepare_features(self, market_data: pd.DataFrame) -> Optional[np.ndarray]:
-        """예측을 위한 특성 준비"""
+        """예측을 위한 특성 준비 (재사용 float32 버퍼에 직접 기록)"""
         try:
+            # 최신 sequence_length 개 데이터만 사용 (필요한 행만 먼저 잘라 변환량 최소화)
+            tail = market_data.iloc[-self.sequence_length:]
+            
             # 필요한 컬럼만 선택
             if self.feature_columns:
                 # 모델 학습 시 사용한 컬럼만 선택
-                missing_columns = set(self.feature_columns) - set(market_data.columns)
+                missing_columns = set(self.feature_columns) - set(tail.columns)
                 if missing_columns:
                     print(f"⚠️ 누락된 컬럼: {missing_columns}")
-                    # 누락된 컬럼은 0으로 채움
-                    for col in missing_columns:
-                        market_data[col] = 0
-                
-                feature_data = market_data[self.feature_columns].copy()
+                # 누락된 컬럼은 0으로 채움 (호출자 DataFrame은 수정하지 않음)
+                feature_data = tail.reindex(columns=self.feature_columns, fill_value=0)
             else:
                 # feature_columns 정보가 없으면 모든 숫자 컬럼 사용
-                numeric_columns = market_data.select_dtypes(include=[np.number]).columns
-                feature_data = market_data[numeric_columns].copy()
+                feature_data = tail.select_dtypes(include=[np.number])
             
-            # NaN 값 처리
-            feature_data = feature_data.fillna(0)
+            # 3D 버퍼 (samples, timesteps, features) - 형태가 같으면 재사용
+            shape = (1,) + feature_data.shape
+            if self._feature_buf is None or self._feature_buf.shape != shape:
+                self._feature_buf = np.empty(shape, dtype=np.float32)
+            feature_array = self._feature_buf[0]
+            feature_array[...] = feature_data.to_numpy(dtype=np.float32, na_value=np.nan)
             
-            # 최신 sequence_length 개 데이터만 사용
-            if len(feature_data) > self.sequence_length:
-                feature_data = feature_data.iloc[-self.sequence_length:]
+            # NaN 값 처리
+            np.copyto(feature_array, 0.0, where=np.isnan(feature_array))
             
             # 정규화
-            if self.scaler:
-                feature_array = self.scaler.transform(feature_data)
+            if isinstance(self.scaler, FastMinMaxScaler):
+                # 버퍼에서 제자리 연산
+                np.subtract(feature_array, self.scaler.data_min_, out=feature_array)
+                np.divide(feature_array, self.scaler.data_range_, out=feature_array)
+            elif self.scaler:
+                feature_array[...] = self.scaler.transform(feature_array)
             else:
                 # 스케일러가 없으면 간단한 정규화
-                feature_array = feature_data.values
                 # 0으로 나누기 방지
                 with np.errstate(divide='ignore', invalid='ignore'):
-                    feature_array = (feature_array - np.mean(feature_array, axis=0)) / (np.std(feature_array, axis=0) + 1e-8)
-                    feature_array = np.nan_to_num(feature_array, 0)
-            
-            # 3D 형태로 변환 (samples, timesteps, features)
-            features = np.expand_dims(feature_array, axis=0)
+                    feature_array -= feature_array.mean(axis=0)
+                    feature_array /= feature_array.std(axis=0) + 1e-8
+                    np.nan_to_num(feature_array, copy=False, nan=0)
             
-            return features
+            return self._feature_buf
             
         except Exception as e:
             print(f"❌ 특성 준비 실패: {e}")
@@ -295,6 +457,28 @@ class AIPredictor:
             "symbol": self.symbol
         }
     
+    def get_prediction_history(self, limit: int = 20) -> List[Dict]:
+        """최근 예측 기록 반환 (최신이 마지막)"""
+        start = max(0, len(self.prediction_history) - limit)
+        return list(islice(self.prediction_history, start, None))
+    
+    def get_signal_summary(self, limit: int = 50) -> Dict:
+        """최근 예측 신호 분포 요약 (신호별 개수/비율)"""
+        start = max(0, len(self.prediction_history) - limit)
+        counts = Counter(
+            p.get('signal', 'NEUTRAL') for p in islice(self.prediction_history, start, None)
+        )
+        total = sum(counts.values())
+        
+        return {
+            "total": total,
+            "counts": {signal: counts.get(signal, 0) for signal in ("ALLOW", "BLOCK", "NEUTRAL")},
+            "ratios": {
+                signal: counts.get(signal, 0) / total if total else 0.0
+                for signal in ("ALLOW", "BLOCK", "NEUTRAL")
+            }
+        }
+    
     def validate_features(self, market_data: pd.DataFrame) -> Dict:
         """특성 검증 (디버깅용)"""
         result = {
@@ -0,0 +1,60 @@
+# 파일 경로: mainpc/nhbot_ai/scaler.py
+# 코드명: 경량 Min-Max 정규화 (sklearn MinMaxScaler 대체, 피클 호환)
+
+import numpy as np
+from typing import Any
+
+class FastMinMaxScaler:
+    """특성별 [0, 1] 정규화 (sklearn MinMaxScaler와 같은 fit/transform 인터페이스)
+
+    - 학습 시 float32 배열 하나에서 최소/범위를 구하고 제자리 연산으로 정규화
+    - 범위가 0인 상수 특성은 1로 나눔 (sklearn과 동일)
+    - 예측기는 기존처럼 pickle 로드 후 transform()만 호출
+    """
+
+    def __init__(self):
+        self.data_min_ = None
+        self.data_range_ = None
+        self.n_features_in_ = 0
+
+    @staticmethod
+    def _as_array(X: Any) -> np.ndarray:
+        """DataFrame/리스트 → float32 2차원 배열"""
+        if hasattr(X, 'to_numpy'):
+            return X.to_numpy(dtype=np.float32)
+        return np.asarray(X, dtype=np.float32)
+
+    def fit(self, X: Any) -> "FastMinMaxScaler":
+        """특성별 최소값/범위 계산"""
+        arr = self._as_array(X)
+        self._fit_array(arr)
+        return self
+
+    def _fit_array(self, arr: np.ndarray):
+        self.data_min_ = arr.min(axis=0)
+        data_range = arr.max(axis=0) - self.data_min_
+        data_range[data_range == 0] = 1.0
+        self.data_range_ = data_range
+        self.n_features_in_ = arr.shape[1]
+
+    def transform(self, X: Any) -> np.ndarray:
+        """정규화 (입력은 변경하지 않음)"""
+        arr = self._as_array(X)
+        return (arr - self.data_min_) / self.data_range_
+
+    def fit_transform(self, X: Any) -> np.ndarray:
+        """fit + transform (변환 배열 하나에서 제자리 연산)"""
+        # 입력과 메모리를 공유하지 않는 float32 사본 1개만 생성
+        if hasattr(X, 'to_numpy'):
+            arr = X.to_numpy(dtype=np.float32, copy=True)
+        else:
+            arr = np.array(X, dtype=np.float32, copy=True)
+        self._fit_array(arr)
+        np.subtract(arr, self.data_min_, out=arr)
+        np.divide(arr, self.data_range_, out=arr)
+        return arr
+
+    def inverse_transform(self, X: Any) -> np.ndarray:
+        """정규화 해제"""
+        arr = self._as_array(X)
+        return arr * self.data_range_ + self.data_min_
@@ -0,0 +1,43 @@
+# 파일 경로: mainpc/nhbot_ai/windower.py
+# 코드명: 학습 배치용 시퀀스 윈도우 수집기 (Numba 가속, 없으면 NumPy)
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # parallel=True(prange)는 쓰지 않음: tf.data map이 여러 스레드에서 동시에 호출하는데
+    # Numba 기본 workqueue 스레딩 레이어는 동시 호출에 안전하지 않음
+    # 대신 nogil로 GIL을 풀어 tf.data 스레드들이 배치를 병렬로 복사
+    @numba.njit(nogil=True, cache=True)
+    def _gather_windows_numba(windows, indices, out):
+        """out[b] = windows[indices[b]] (배치 샘플 단위 복사)"""
+        seq = out.shape[1]
+        n_features = out.shape[2]
+        for b in range(indices.shape[0]):
+            start = indices[b]
+            for t in range(seq):
+                for f in range(n_features):
+                    out[b, t, f] = windows[start, t, f]
+        return out
+
+def gather_windows(windows: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """슬라이딩 윈도우 뷰 (샘플, 시퀀스, 특성)에서 배치 하나를 연속 배열로 복사
+
+    Args:
+        windows: sliding_window_view로 만든 3차원 뷰 (복사 없음)
+        indices: 배치에 포함될 샘플 인덱스
+
+    Returns:
+        (len(indices), 시퀀스, 특성) 연속 배열
+    """
+    if not NUMBA_AVAILABLE:
+        return windows[indices]
+    
+    # 배치마다 새 배열 (tf.data prefetch 중인 이전 배치와 메모리를 공유하지 않도록)
+    out = np.empty((len(indices),) + windows.shape[1:], dtype=windows.dtype)
+    return _gather_windows_numba(windows, indices.astype(np.int64, copy=False), out)
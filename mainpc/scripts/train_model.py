@@ -181,17 +181,15 @@ class TrainingExecutor:
                
                # 상태 업데이트
                status = trainer.get_training_status()
-               self.training_status['current_epoch'] = status.get('current_epoch', 0)
-               
-               if status.get('metrics'):
-                   self.training_status['accuracy'] = status['metrics'].get('accuracy', 0)
+               self.training_status['current_epoch'] = status.current_epoch
+               self.training_status['accuracy'] = status.accuracy
                
                self._update_status()
            
            # 최종 결과
            final_status = trainer.get_training_status()
            
-           if final_status['status'] == 'completed':
+           if final_status.status == 'completed':
                # 모델명 찾기 (가장 최근 생성된 모델)
                model_files = list(self.models_dir.glob("model_*.h5"))
                if model_files:
@@ -204,9 +202,9 @@ class TrainingExecutor:
                    'status': 'completed',
                    'start_time': self.training_status['start_time'],
                    'end_time': datetime.now().isoformat(),
-                   'current_epoch': final_status.get('current_epoch', args.epochs),
+                   'current_epoch': final_status.current_epoch,
                    'total_epochs': args.epochs,
-                   'accuracy': final_status['metrics'].get('accuracy', 0),
+                   'accuracy': final_status.accuracy,
                    'model_name': model_name,
                    'error': None,
                    'parameters': self.training_status['parameters']
@@ -219,7 +217,7 @@ class TrainingExecutor:
                logger.info("="*60)
                
            else:
-               raise Exception(f"학습 실패: {final_status.get('status')}")
+               raise Exception(f"학습 실패: {final_status.status}")
            
        except Exception as e:
            logger.error(f"❌ 학습 중 오류 발생: {e}")
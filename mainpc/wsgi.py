@@ -0,0 +1,16 @@
+# 파일 경로: mainpc/wsgi.py
+# 코드명: 메인 PC AI 서버 WSGI 진입점 (gunicorn용)
+#
+# 실행:
+#   gunicorn -w 1 -k gthread --threads 32 -b 0.0.0.0:5000 wsgi:app
+#
+# 학습 상태/상태 변경 알림(Condition)/SSE 스트림이 프로세스 메모리에 있으므로 워커는 1개,
+# 동시 요청은 스레드로 처리 (학습 자체의 수평 확장은 Celery 워커로)
+
+from ai_server import app, ai_manager
+
+# 예측 모델 로드/워밍업 + 최신 시장 데이터 갱신을 시작 시점에 (첫 /predict 요청 지연 방지)
+ai_manager.warm_predictor()
+ai_manager.start_data_refresher()
+
+__all__ = ['app']
@@ -1,11 +1,12 @@
 # 파일 경로: web/routes/ai_api.py
 # 코드명: AI 관련 API 엔드포인트 (AIClient 통합 버전)
 
-from flask import Blueprint, request, session, jsonify
+from flask import Blueprint, Response, request, session, jsonify, stream_with_context
 from functools import wraps
 from datetime import datetime
 import json
 import os
+import time
 from pathlib import Path
 
 # AI 통합 클라이언트 임포트
@@ -73,6 +74,20 @@ def ai_api_error(message, code='AI_ERROR', status_code=400, details=None):
         response['details'] = details
     return jsonify(response), status_code
 
+def _dir_size(path):
+    """디렉토리 전체 파일 크기 합계 (scandir 1회 순회, 없으면 0)"""
+    total = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    total += _dir_size(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return total
+
 def log_ai_event(level, category, message):
     """AI 이벤트 로깅"""
     try:
@@ -101,6 +116,7 @@ def get_models():
     """AI 모델 목록 조회"""
     try:
         client = get_ai_client()
+        client.sync_if_stale()  # 목록 조회는 로컬 메타데이터 기준, 주기적으로만 원격 동기화
         models = client.get_model_list()
         active_model = client.get_active_model()
         storage_info = client.get_storage_info()
@@ -320,39 +336,44 @@ def stop_training():
         log_ai_event('ERROR', 'AI', f'학습 중지 실패: {str(e)}')
         return ai_api_error('학습 중지 중 오류가 발생했습니다', 'TRAINING_ERROR', 500)
 
+def build_training_status(client):
+    """학습 상태 + 화면 표시용 정보 (진행률/경과 시간)"""
+    status = client.get_training_status()
+    
+    # 상태 정보 보강
+    enhanced_status = {
+        **status,
+        'is_training': client.is_training,
+        'progress_percentage': 0
+    }
+    
+    # 진행률 계산
+    if status.get('total_epochs', 0) > 0:
+        enhanced_status['progress_percentage'] = (
+            status.get('current_epoch', 0) / status['total_epochs'] * 100
+        )
+    
+    # 경과 시간 계산
+    if status.get('start_time'):
+        try:
+            start_time = datetime.fromisoformat(status['start_time'])
+            elapsed = datetime.now() - start_time
+            enhanced_status['elapsed_seconds'] = int(elapsed.total_seconds())
+            enhanced_status['elapsed_formatted'] = str(elapsed).split('.')[0]
+        except:
+            pass
+    
+    return enhanced_status
+
 @ai_api_bp.route('/training/status', methods=['GET'])
 @ai_api_required
 def get_training_status():
     """AI 모델 학습 상태 조회"""
     try:
         client = get_ai_client()
-        status = client.get_training_status()
-        
-        # 상태 정보 보강
-        enhanced_status = {
-            **status,
-            'is_training': client.is_training,
-            'progress_percentage': 0
-        }
-        
-        # 진행률 계산
-        if status.get('total_epochs', 0) > 0:
-            enhanced_status['progress_percentage'] = (
-                status.get('current_epoch', 0) / status['total_epochs'] * 100
-            )
-        
-        # 경과 시간 계산
-        if status.get('start_time'):
-            try:
-                start_time = datetime.fromisoformat(status['start_time'])
-                elapsed = datetime.now() - start_time
-                enhanced_status['elapsed_seconds'] = int(elapsed.total_seconds())
-                enhanced_status['elapsed_formatted'] = str(elapsed).split('.')[0]
-            except:
-                pass
         
         return ai_api_success(
-            data=enhanced_status,
+            data=build_training_status(client),
             message='학습 상태 조회 성공'
         )
         
@@ -360,6 +381,50 @@ def get_training_status():
         log_ai_event('ERROR', 'AI', f'학습 상태 조회 실패: {str(e)}')
         return ai_api_error('학습 상태 조회 중 오류가 발생했습니다', 'STATUS_ERROR', 500)
 
+STATUS_STREAM_KEEPALIVE = 25  # 변경이 없을 때 keepalive 주석을 보내는 간격 (초)
+STATUS_STREAM_MAX_AGE = 300  # 연결 하나의 최대 유지 시간 (초), 끊기면 EventSource가 자동 재연결
+
+@ai_api_bp.route('/training/status/stream', methods=['GET'])
+@ai_api_required
+def stream_training_status():
+    """AI 모델 학습 상태 스트림 (Server-Sent Events)
+    
+    브라우저가 주기적으로 /training/status를 조회하는 대신 EventSource로 연결해 두면
+    AIClient 모니터가 상태를 갱신할 때마다 바로 이벤트로 전달
+    
+    스트림은 waitress 워커 스레드 하나를 점유하므로 무한히 열어 두지 않음:
+    학습 중이 아니면 (완료/실패/중지/대기) 마지막 상태를 보내고 종료하고,
+    학습 중이어도 STATUS_STREAM_MAX_AGE가 지나면 종료 (브라우저가 재연결)
+    """
+    client = get_ai_client()
+    
+    def event_stream():
+        version = -1
+        deadline = time.monotonic() + STATUS_STREAM_MAX_AGE
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            
+            new_version = client.wait_for_status_change(version, min(STATUS_STREAM_KEEPALIVE, remaining))
+            if new_version == version:
+                yield ": keepalive\n\n"
+                continue
+            
+            version = new_version
+            status = build_training_status(client)
+            payload = json.dumps(status, ensure_ascii=False, default=str)
+            yield f"id: {version}\ndata: {payload}\n\n"
+            
+            if not status['is_training']:
+                return  # 브라우저는 이 이벤트를 받고 연결을 닫음
+    
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @ai_api_bp.route('/training/parameters', methods=['GET'])
 @ai_api_required
 def get_training_parameters():
@@ -505,8 +570,8 @@ def get_ai_system_info():
         data_dir = Path("data")
         models_dir = Path("models")
         
-        data_size = sum(f.stat().st_size for f in data_dir.glob("**/*") if f.is_file()) if data_dir.exists() else 0
-        models_size = sum(f.stat().st_size for f in models_dir.glob("**/*") if f.is_file()) if models_dir.exists() else 0
+        data_size = _dir_size(data_dir)
+        models_size = _dir_size(models_dir)
         
         system_info = {
             'storage': storage_info,
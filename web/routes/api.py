@@ -6,6 +6,7 @@ from functools import wraps
 from datetime import datetime
 import json, copy
 from config.models import User, UserConfig, SystemLog, ConfigHistory, db, get_kst_now
+from api.utils import get_current_user
 
 api_bp = Blueprint('api', __name__)
 
@@ -487,7 +488,7 @@ def user_ping():
         if not user_id:
             return api_error('사용자 정보를 찾을 수 없습니다', 'USER_NOT_FOUND', 401)
 
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return api_error('사용자를 찾을 수 없습니다', 'USER_NOT_FOUND', 404)
         
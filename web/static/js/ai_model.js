@@ -4,6 +4,7 @@
 // 전역 변수
 let isTraining = false;
 let statusInterval = null;
+let statusSource = null;  // 학습 상태 SSE 연결 (EventSource)
 let selectedIndicators = {};
 let trainingParams = {};
 
@@ -684,34 +685,56 @@ function updateTrainingStatus(status) {
     }
     
     // 학습 중이면 모니터링 시작
-    if (isTraining && !statusInterval) {
+    if (isTraining && !statusInterval && !statusSource) {
         startStatusMonitoring();
     }
 }
 
 function startStatusMonitoring() {
-    if (statusInterval) return;
+    if (statusInterval || statusSource) return;
+    
+    // 서버 푸시 (상태가 바뀔 때만 수신), 미지원 브라우저는 5초 주기 조회
+    if (window.EventSource) {
+        statusSource = new EventSource('/api/ai/training/status/stream');
+        statusSource.onmessage = (event) => {
+            const status = JSON.parse(event.data);
+            updateTrainingStatus(status);
+            checkTrainingFinished();
+            // 학습 중이 아니면 서버가 스트림을 끝내므로 재연결하지 않도록 닫기
+            if (!status.is_training) {
+                stopStatusMonitoring();
+            }
+        };
+        return;
+    }
     
     statusInterval = setInterval(async () => {
         await loadTrainingStatus();
+        checkTrainingFinished();
+    }, 5000); // 5초마다 확인
+}
+
+function checkTrainingFinished() {
+    // 학습 완료 체크
+    const statusBadge = document.getElementById('trainingStatus');
+    if (statusBadge && (statusBadge.textContent === '완료' || statusBadge.textContent === '실패')) {
+        stopStatusMonitoring();
+        loadModels(); // 모델 목록 새로고침
         
-        // 학습 완료 체크
-        const statusBadge = document.getElementById('trainingStatus');
-        if (statusBadge && (statusBadge.textContent === '완료' || statusBadge.textContent === '실패')) {
-            stopStatusMonitoring();
-            loadModels(); // 모델 목록 새로고침
-            
-            // 완료/실패 알림
-            if (statusBadge.textContent === '완료') {
-                showAdvancedToast('success', '학습 완료', 'AI 모델 학습이 완료되었습니다!', 5000);
-            } else {
-                showAdvancedToast('error', '학습 실패', 'AI 모델 학습이 실패했습니다.', 5000);
-            }
+        // 완료/실패 알림
+        if (statusBadge.textContent === '완료') {
+            showAdvancedToast('success', '학습 완료', 'AI 모델 학습이 완료되었습니다!', 5000);
+        } else {
+            showAdvancedToast('error', '학습 실패', 'AI 모델 학습이 실패했습니다.', 5000);
         }
-    }, 5000); // 5초마다 확인
+    }
 }
 
 function stopStatusMonitoring() {
+    if (statusSource) {
+        statusSource.close();
+        statusSource = null;
+    }
     if (statusInterval) {
         clearInterval(statusInterval);
         statusInterval = null;